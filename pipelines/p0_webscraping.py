@@ -5,9 +5,21 @@ Downloads PDFs from uitvoeringarbeidsvoorwaardenwetgeving.nl for specific CAO nu
 import os
 import sys
 import time
+import csv
+import json
+import queue
+import shutil
+import shelve
+import tempfile
+import argparse
+import logging
+import logging.handlers
+import threading
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import pandas as pd
-from pathlib import Path
+from openpyxl import load_workbook
 
 # Add the parent directory to Python path so we can import utils
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -18,15 +30,15 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import NoSuchElementException, TimeoutException, StaleElementReferenceException, WebDriverException
-from webdriver_manager.chrome import ChromeDriverManager
+from selenium.common.exceptions import NoSuchElementException, TimeoutException, WebDriverException
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from bs4 import BeautifulSoup
 import urllib.parse
 import re
 import random
 from utils.OUTPUT_tracker import update_progress
-import traceback
 import yaml
+logger = logging.getLogger(__name__)
 with open('conf/config.yaml', 'r') as f:
     config = yaml.safe_load(f)
 WEBSITE_URL = (
@@ -37,39 +49,212 @@ INPUT_EXCEL_PATH = (
 OUTPUT_FOLDER = config['paths']['inputs_pdfs']
 DOWNLOAD_DELAY = 2
 MAX_RETRIES = 3
+SEARCH_INTERVAL = 0.5  # Minimum seconds between search page loads across all drivers
 MAX_PDFS_PER_CAO = 10000
+NUM_DRIVERS = 4  # Number of pooled Chrome drivers processing CAOs in parallel
+DOWNLOAD_WORKERS = 16  # Maximum concurrent PDF downloads across all CAOs
+MAX_CONCURRENT_REQUESTS = 4  # PDF requests allowed in flight to the website at once
+DOWNLOAD_CHUNK_SIZE = 262144  # Bytes read per iteration when streaming a PDF
+MAX_PDF_SIZE_MB = 500  # Refuse downloads whose Content-Length exceeds this size
+# Resources blocked in Chrome via DevTools; only text and links are scraped.
+# Stylesheets stay enabled because the search modal relies on CSS visibility.
+BLOCKED_URL_PATTERNS = ['*.woff', '*.woff2', '*.ttf', '*.otf', '*.png',
+    '*.jpg', '*.jpeg', '*.gif', '*.svg', '*.ico', '*.webp', '*.mp4',
+    '*google-analytics*', '*googletagmanager*', '*doubleclick*']
+PAGE_CACHE_PATH = os.path.join(OUTPUT_FOLDER, 'detail_page_cache')
+PAGE_CACHE_EXPIRY_DAYS = 7  # Re-scrape cached detail pages after this many days
+DOWNLOADED_URLS_PATH = os.path.join(OUTPUT_FOLDER, 'downloaded_pdf_urls.json')
+# Consecutive detail pages that may fail to parse over plain HTTP before the
+# rest of the CAO is read through the browser only
+MAX_HTTP_PAGE_FAILURES = 3
 
 # Date filter configuration for CAO document search
 MIN_INGANGSDATUM = '01-01-1900'  # Minimum start date (earliest documents to include)
 MAX_INGANGSDATUM = '01-01-2006'  # Maximum start date (latest documents to include - gets pre-2006 docs)
-extracted_data = []
-all_main_link_logs = []
-existing_info_df = None
-existing_log_df = None
+
+# Precompiled date patterns for extract_page_info; each alternation covers the
+# supported formats (d-m-yyyy, d/m/yyyy, d.m.yyyy, yyyy-m-d, d-m-yy)
+DATE_PATTERN = (
+    '(\\d{1,2}-\\d{1,2}-\\d{4}|\\d{1,2}/\\d{1,2}/\\d{4}|\\d{1,2}\\.\\d{1,2}\\.\\d{4}|\\d{4}-\\d{1,2}-\\d{1,2}|\\d{1,2}-\\d{1,2}-\\d{2})'
+    )
+# All date labels are matched by one alternation so the page text is scanned
+# once; the 'kvo datum' label only accepts d-m-yyyy and d/m/yyyy dates
+PAGE_DATES_RE = re.compile(
+    '(?P<label>Ingangsdatum|Expiratiedatum|Datum formele Kennisgeving van Ontvangst)\\s*:?\\s*(?P<date>'
+     + DATE_PATTERN +
+    ')|kvo datum\\s*:?\\s*(?P<kvo_date>\\d{1,2}-\\d{1,2}-\\d{4}|\\d{1,2}/\\d{1,2}/\\d{4})'
+    , re.IGNORECASE)
+DATE_LABEL_FIELDS = {'ingangsdatum': 'ingangsdatum', 'expiratiedatum':
+    'expiratiedatum', 'datum formele kennisgeving van ontvangst':
+    'datum_kennisgeving'}
+
+# JavaScript snippets that batch DOM reads into a single WebDriver command
+PAGE_DATA_SCRIPT = """
+var title = document.querySelector('div.aandachttekst__tekst > span');
+return {
+    pageName: title ? title.innerText : null,
+    bodyText: document.body ? document.body.innerText : '',
+    pdfs: Array.from(document.querySelectorAll('a.link--nochevron'))
+        .map(function (a) { return a.href; })
+        .filter(function (href) { return href && href.endsWith('.pdf'); })
+};
+"""
+DATE_FIELD_NAMES_SCRIPT = """
+return Array.from(document.getElementsByClassName('datumveld'))
+    .map(function (el) { return el.getAttribute('name'); });
+"""
+SET_INPUT_VALUE_SCRIPT = """
+arguments[0].value = arguments[1];
+arguments[0].dispatchEvent(new Event('input', {bubbles: true}));
+arguments[0].dispatchEvent(new Event('change', {bubbles: true}));
+"""
+MAIN_LINKS_SCRIPT = """
+return Array.from(document.querySelectorAll('a.zaakregel__verwijzing'))
+    .map(function (a) { return {text: a.innerText, href: a.href}; });
+"""
+EXTRACTED_INFO_COLUMNS = ['cao_number', 'id', 'ingangsdatum',
+    'expiratiedatum', 'datum_kennisgeving', 'pdf_name', 'page_name',
+    'main_link_url']
+MAIN_LINK_LOG_COLUMNS = ['cao_number', 'main_link_url', 'pdf_found',
+    'pdf_name', 'pdfs_found_count', 'id']
+extracted_info_file = None
+extracted_info_writer = None
+_extracted_info_lock = threading.Lock()
+main_link_log_file = None
+main_link_log_writer = None
+logged_main_links = set()
+_main_link_log_lock = threading.Lock()
 existing_pdf_names_by_cao = {}
 existing_urls_by_cao = {}
 existing_ids_by_cao = {}
+_chromedriver_path = None
+_chromedriver_lock = threading.Lock()
+_chrome_profile_dirs = []
+_progress_lock = threading.Lock()
+_search_pace_lock = threading.Lock()
+_next_search_time = 0.0
+_filename_lock = threading.Lock()
+_downloaded_urls_lock = threading.Lock()
+_download_slots = threading.BoundedSemaphore(MAX_CONCURRENT_REQUESTS)
+downloaded_pdf_paths = {}
+if os.path.exists(DOWNLOADED_URLS_PATH):
+    try:
+        with open(DOWNLOADED_URLS_PATH, 'r', encoding='utf-8') as f:
+            downloaded_pdf_paths = {url: path for url, path in json.load(f).
+                items() if os.path.exists(path)}
+    except (OSError, ValueError):
+        downloaded_pdf_paths = {}
+_download_executor = ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS)
+
+
+def create_http_session():
+    """
+    Create a requests session with keep-alive connection pooling and automatic
+    retries on transient server errors, shared by all PDF downloads.
+    Returns:
+        requests.Session: Configured HTTP session.
+    """
+    session = requests.Session()
+    retry = Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500,
+        502, 503, 504], allowed_methods=['GET', 'HEAD'])
+    # Download workers and the per-driver detail page fetches share this pool;
+    # sizing it for both keeps every connection alive instead of discarding
+    # the ones that do not fit when the pool is full
+    adapter = HTTPAdapter(pool_connections=DOWNLOAD_WORKERS, pool_maxsize=
+        DOWNLOAD_WORKERS + NUM_DRIVERS, max_retries=retry)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+http_session = create_http_session()
+page_cache = None
+_page_cache_lock = threading.Lock()
+
+
+def open_page_cache(force_refresh=False):
+    """
+    Open the persistent detail-page cache, keyed by CAO number and detail URL.
+    Args:
+        force_refresh (bool): If True, discard all cached entries first.
+    """
+    global page_cache
+    os.makedirs(OUTPUT_FOLDER, exist_ok=True)
+    page_cache = shelve.open(PAGE_CACHE_PATH, flag='n' if force_refresh else
+        'c')
+
+
+def close_page_cache():
+    """Flush and close the persistent detail-page cache if it is open."""
+    global page_cache
+    with _page_cache_lock:
+        if page_cache is not None:
+            page_cache.close()
+            page_cache = None
+
+
+def get_cached_page(cao_number, detail_url):
+    """
+    Look up previously scraped metadata for a detail page.
+    Args:
+        cao_number (int or str): The CAO number being processed.
+        detail_url (str): URL of the detail page.
+    Returns:
+        dict or None: Cached entry if present and not expired, None otherwise.
+    """
+    with _page_cache_lock:
+        if page_cache is None:
+            return None
+        entry = page_cache.get(f'{cao_number}|{detail_url}')
+    if entry is None:
+        return None
+    if time.time() - entry['timestamp'] > PAGE_CACHE_EXPIRY_DAYS * 86400:
+        return None
+    return entry
+
+
+def store_cached_page(cao_number, detail_url, pdf_url, description,
+    page_info, pdfs_found_count):
+    """
+    Store the scraped metadata of a detail page in the persistent cache.
+    Args:
+        cao_number (int or str): The CAO number being processed.
+        detail_url (str): URL of the detail page.
+        pdf_url (str or None): URL of the PDF found on the page, if any.
+        description (str): Attention text shown on the page.
+        page_info (dict or None): Metadata extracted by extract_page_info.
+        pdfs_found_count (int): Number of PDF links on the page.
+    """
+    with _page_cache_lock:
+        if page_cache is None:
+            return
+        page_cache[f'{cao_number}|{detail_url}'] = {'timestamp': time.time(),
+            'pdf_url': pdf_url, 'description': description, 'page_info':
+            dict(page_info) if page_info else None, 'pdfs_found_count':
+            pdfs_found_count}
+# Index earlier runs' rows with plain csv readers; only a few columns are
+# needed, and keeping ids as read avoids pandas turning them into floats
 if os.path.exists(os.path.join(OUTPUT_FOLDER, 'extracted_cao_info.csv')):
-    existing_info_df = pd.read_csv(os.path.join(OUTPUT_FOLDER,
-        'extracted_cao_info.csv'), sep=';')
-    for _, row in existing_info_df.iterrows():
-        cao = str(row['cao_number'])
-        pdf_name = str(row['pdf_name'])
-        id_val = str(row['id'])
-        main_link_url = str(row.get('main_link_url', ''))
-        existing_pdf_names_by_cao.setdefault(cao, set()).add(pdf_name)
-        existing_ids_by_cao.setdefault(cao, set()).add(id_val)
-        if main_link_url:
-            existing_urls_by_cao.setdefault(cao, set()).add(main_link_url)
+    with open(os.path.join(OUTPUT_FOLDER, 'extracted_cao_info.csv'), 'r',
+        newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f, delimiter=';'):
+            cao = str(row['cao_number'])
+            pdf_name = str(row['pdf_name'])
+            id_val = str(row['id'])
+            main_link_url = row.get('main_link_url') or ''
+            existing_pdf_names_by_cao.setdefault(cao, set()).add(pdf_name)
+            existing_ids_by_cao.setdefault(cao, set()).add(id_val)
+            if main_link_url:
+                existing_urls_by_cao.setdefault(cao, set()).add(main_link_url)
 if os.path.exists(os.path.join(OUTPUT_FOLDER, 'main_links_log.csv')):
-    existing_log_df = pd.read_csv(os.path.join(OUTPUT_FOLDER,
-        'main_links_log.csv'), sep=';')
     # Also load URLs from main_links_log.csv for duplicate detection
-    for _, row in existing_log_df.iterrows():
-        cao = str(row['cao_number'])
-        main_link_url = str(row.get('main_link_url', ''))
-        if main_link_url:
-            existing_urls_by_cao.setdefault(cao, set()).add(main_link_url)
+    with open(os.path.join(OUTPUT_FOLDER, 'main_links_log.csv'), 'r',
+        newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f, delimiter=';'):
+            cao = str(row['cao_number'])
+            main_link_url = row.get('main_link_url') or ''
+            if main_link_url:
+                existing_urls_by_cao.setdefault(cao, set()).add(main_link_url)
 
 
 def random_delay(min_seconds=0.5, max_seconds=1.2):
@@ -98,6 +283,20 @@ def close_overlays(driver):
         pass
 
 
+def get_chromedriver_path():
+    """
+    Return the ChromeDriver binary path, installing it on first use only.
+    The path is cached so pooled drivers do not repeat the install/version check.
+    """
+    global _chromedriver_path
+    with _chromedriver_lock:
+        if _chromedriver_path is None:
+            # Imported lazily: only needed when a driver is actually created
+            from webdriver_manager.chrome import ChromeDriverManager
+            _chromedriver_path = ChromeDriverManager().install()
+    return _chromedriver_path
+
+
 def setup_chrome_driver():
     """
     Set up and return a Selenium Chrome WebDriver with options for headless operation,
@@ -109,10 +308,22 @@ def setup_chrome_driver():
     prefs = {'download.default_directory': os.path.abspath(OUTPUT_FOLDER),
         'download.prompt_for_download': False, 'download.directory_upgrade':
         True, 'plugins.always_open_pdf_externally': True,
-        'safebrowsing.enabled': True}
+        'safebrowsing.enabled': True,
+        # JavaScript and stylesheets stay on: the search modal needs both
+        'profile.managed_default_content_settings': {'images': 2,
+        'plugins': 2, 'popups': 2, 'notifications': 2, 'media_stream': 2,
+        'javascript': 1}}
     chrome_options.add_experimental_option('prefs', prefs)
+    # Return from driver.get at DOMContentLoaded; every element the scraper
+    # needs is awaited explicitly with WebDriverWait
+    chrome_options.page_load_strategy = 'eager'
     chrome_options.add_argument('--headless')
-    chrome_options.add_argument('--incognito')
+    # No --incognito: it disables the disk cache, and the per-driver profile
+    # below lets the search page's assets be reused from cache across CAOs.
+    # Each pooled driver gets its own profile so cookies and sessions never collide
+    profile_dir = tempfile.mkdtemp(prefix='chrome-profile-')
+    _chrome_profile_dirs.append(profile_dir)
+    chrome_options.add_argument(f'--user-data-dir={profile_dir}')
     chrome_options.add_argument('--disable-blink-features=AutomationControlled'
         )
     chrome_options.add_argument('--disable-web-security')
@@ -128,6 +339,7 @@ def setup_chrome_driver():
     chrome_options.add_argument('--disable-extensions')
     chrome_options.add_argument('--disable-plugins')
     chrome_options.add_argument('--disable-images')
+    chrome_options.add_argument('--blink-settings=imagesEnabled=false')
     chrome_options.add_argument('--disable-background-timer-throttling')
     chrome_options.add_argument('--disable-backgrounding-occluded-windows')
     chrome_options.add_argument('--disable-renderer-backgrounding')
@@ -149,8 +361,15 @@ def setup_chrome_driver():
     chrome_options.add_experimental_option('excludeSwitches', [
         'enable-automation'])
     chrome_options.add_experimental_option('useAutomationExtension', False)
-    service = Service(ChromeDriverManager().install())
+    service = Service(get_chromedriver_path())
     driver = webdriver.Chrome(service=service, options=chrome_options)
+    try:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls':
+            BLOCKED_URL_PATTERNS})
+        driver.execute_cdp_cmd('Page.setAdBlockingEnabled', {'enabled': True})
+    except Exception as e:
+        logger.warning('  Warning: could not enable resource blocking: %s', e)
     driver.execute_script(
         "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"
         )
@@ -173,16 +392,62 @@ def sanitize_filename(filename):
     return filename
 
 
-def download_pdf(pdf_url, filename, output_folder):
+def release_filename(file_path, existing_names):
+    """
+    Remove the placeholder of a failed download and free its reserved name.
+    Args:
+        file_path (str): Path of the reserved placeholder file.
+        existing_names (set): File names present in the output folder.
+    """
+    with _filename_lock:
+        existing_names.discard(os.path.basename(file_path))
+        try:
+            os.remove(file_path)
+        except OSError:
+            pass
+
+
+# Returned by download_pdf when an identical local file was kept instead of
+# downloading the PDF again
+PDF_REUSED = object()
+
+
+def remote_size_matches(pdf_url, local_path):
+    """
+    Compare the Content-Length reported by a HEAD request with a local file.
+    The HEAD request takes a download slot like a GET, so it is paced too.
+    Args:
+        pdf_url (str): URL of the PDF.
+        local_path (str): Path of the local file.
+    Returns:
+        bool: True if the server reports a size equal to the local file size.
+    """
+    _download_slots.acquire()
+    try:
+        response = http_session.head(pdf_url, allow_redirects=True, timeout=15)
+        remote_size = int(response.headers.get('Content-Length') or 0)
+        return (response.status_code == 200 and remote_size > 0 and os.path.
+            getsize(local_path) == remote_size)
+    except (requests.RequestException, OSError, ValueError):
+        return False
+    finally:
+        release_download_slot()
+
+
+def download_pdf(pdf_url, filename, output_folder, existing_names):
     """
     Download a PDF file from the given URL and save it in the specified output folder.
     Args:
         pdf_url (str): URL of the PDF to download.
         filename (str): Fallback filename if the original cannot be determined.
         output_folder (str): Directory to save the PDF.
+        existing_names (set): File names already in output_folder; the chosen
+            name is added so later downloads skip it without touching the disk.
     Returns:
-        str or None: The filename used if successful, None otherwise.
+        str or None: The filename used if successful, PDF_REUSED if an
+            identical local file was kept, None otherwise.
     """
+    file_path = None
     try:
         os.makedirs(output_folder, exist_ok=True)
         parsed_url = urllib.parse.urlparse(pdf_url)
@@ -190,25 +455,106 @@ def download_pdf(pdf_url, filename, output_folder):
         original_filename = sanitize_filename(original_filename)
         if not original_filename or original_filename == '':
             original_filename = f'{sanitize_filename(filename)}.pdf'
+        # A same-named file of the same size is this PDF from an earlier run
+        if original_filename in existing_names:
+            existing_path = os.path.join(output_folder, original_filename)
+            if remote_size_matches(pdf_url, existing_path):
+                with _downloaded_urls_lock:
+                    downloaded_pdf_paths[pdf_url] = existing_path
+                return PDF_REUSED
         base_name, ext = os.path.splitext(original_filename)
         counter = 1
         final_filename = original_filename
-        while os.path.exists(os.path.join(output_folder, final_filename)):
-            final_filename = f'{base_name}_{counter}{ext}'
-            counter += 1
-        file_path = os.path.join(output_folder, final_filename)
-        response = requests.get(pdf_url, stream=True, timeout=30)
-        if response.status_code == 200:
-            with open(file_path, 'wb') as pdf_file:
-                for chunk in response.iter_content(chunk_size=8192):
-                    pdf_file.write(chunk)
+        # Reserve the filename under a lock so concurrent downloads never collide
+        with _filename_lock:
+            while final_filename in existing_names:
+                final_filename = f'{base_name}_{counter}{ext}'
+                counter += 1
+            existing_names.add(final_filename)
+            file_path = os.path.join(output_folder, final_filename)
+            open(file_path, 'wb').close()
+        # A PDF already fetched for another CAO is copied locally, not re-downloaded
+        with _downloaded_urls_lock:
+            cached_path = downloaded_pdf_paths.get(pdf_url)
+        if cached_path and os.path.exists(cached_path):
+            shutil.copyfile(cached_path, file_path)
             return final_filename
-        else:
-            return None
+        # Hold a download slot for the request plus DOWNLOAD_DELAY afterwards
+        _download_slots.acquire()
+        try:
+            response = http_session.get(pdf_url, stream=True, timeout=30)
+            with response:
+                if response.status_code != 200:
+                    release_filename(file_path, existing_names)
+                    return None
+                content_length = int(response.headers.get('Content-Length') or
+                    0)
+                if content_length > MAX_PDF_SIZE_MB * 1024 * 1024:
+                    logger.warning('    ✗ PDF too large (%.1fMB > %sMB): %s',
+                        content_length / (1024 * 1024), MAX_PDF_SIZE_MB,
+                        pdf_url)
+                    release_filename(file_path, existing_names)
+                    return None
+                chunks = response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE)
+                first_chunk = next(chunks, b'')
+                # Reject HTML error/access-denied pages before writing anything
+                if not first_chunk.startswith(b'%PDF-'):
+                    logger.warning('    ✗ Not a PDF (bad magic bytes): %s',
+                        pdf_url)
+                    release_filename(file_path, existing_names)
+                    return None
+                with open(file_path, 'wb', buffering=1024 * 1024
+                    ) as pdf_file:
+                    pdf_file.write(first_chunk)
+                    for chunk in chunks:
+                        pdf_file.write(chunk)
+                with _downloaded_urls_lock:
+                    downloaded_pdf_paths[pdf_url] = file_path
+                return final_filename
+        finally:
+            release_download_slot()
     except Exception as e:
+        if file_path:
+            release_filename(file_path, existing_names)
         return None
 
 
+def save_downloaded_urls():
+    """
+    Persist the downloaded PDF URL -> local path index for later runs. Written
+    to a temporary file and swapped in, so a run killed mid-write keeps the
+    previous index.
+    """
+    with _downloaded_urls_lock:
+        snapshot = dict(downloaded_pdf_paths)
+    tmp_path = DOWNLOADED_URLS_PATH + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(snapshot, f, ensure_ascii=False)
+    os.replace(tmp_path, DOWNLOADED_URLS_PATH)
+
+
+def release_download_slot():
+    """
+    Free a download slot DOWNLOAD_DELAY seconds from now without blocking the
+    calling worker, so the per-request pacing is kept while the worker moves on.
+    """
+    timer = threading.Timer(DOWNLOAD_DELAY, _download_slots.release)
+    timer.daemon = True
+    timer.start()
+
+
+def set_input_value(driver, element, value):
+    """
+    Replace the value of an input field in one script call and fire the input
+    and change events the form listens to, instead of typing key by key.
+    Args:
+        driver (webdriver.Chrome): Selenium WebDriver instance.
+        element (WebElement): The input field to fill.
+        value (str): The value to set.
+    """
+    driver.execute_script(SET_INPUT_VALUE_SCRIPT, element, value)
+
+
 def search_cao_number(driver, cao_number):
     """
     Search for a specific CAO number on the website using the provided Selenium driver.
@@ -229,17 +575,8 @@ def search_cao_number(driver, cao_number):
                 random_delay(0.5, 1.0)
         else:
             return False
-        driver.execute_script('arguments[0].scrollIntoView(true);', search_box)
-        random_delay(0.3, 0.8)
         search_box.click()
-        random_delay(0.3, 0.8)
-        search_box.clear()
-        random_delay(0.3, 0.8)
-        cao_str = str(cao_number)
-        for char in cao_str:
-            search_box.send_keys(char)
-            random_delay(0.08, 0.15)
-        random_delay(0.5, 1.2)
+        set_input_value(driver, search_box, str(cao_number))
         for _ in range(2):
             try:
                 submit_button = WebDriverWait(driver, 8).until(EC.
@@ -251,11 +588,7 @@ def search_cao_number(driver, cao_number):
                 random_delay(0.5, 1.0)
         else:
             return False
-        driver.execute_script('arguments[0].scrollIntoView(true);',
-            submit_button)
-        random_delay(0.5, 1.2)
         submit_button.click()
-        random_delay(0.5, 1.2)
         for _ in range(2):
             try:
                 geselecteerd = WebDriverWait(driver, 12).until(EC.
@@ -267,23 +600,23 @@ def search_cao_number(driver, cao_number):
                 random_delay(0.5, 1.0)
         else:
             return False
-        driver.execute_script('arguments[0].scrollIntoView(true);',
-            geselecteerd)
-        random_delay(0.5, 1.2)
         geselecteerd.click()
-        random_delay(0.5, 1.2)
+        try:
+            WebDriverWait(driver, 8).until(EC.presence_of_element_located((By
+                .CLASS_NAME, 'datumveld')))
+        except TimeoutException:
+            pass
         for _ in range(2):
             try:
                 # Use name attribute to target the specific MIN ingangsdatum field
                 # This is more reliable than class name when multiple elements have the same class
                 # Note: Field names change dynamically, so we need to find them at runtime
-                all_date_fields = driver.find_elements(By.CLASS_NAME, 'datumveld')
-                min_field_name = None
-                for field in all_date_fields:
-                    field_name = field.get_attribute('name')
-                    if field_name and '_dva' in field_name:
-                        min_field_name = field_name
-                        break
+                # All names are read in one script call instead of one
+                # get_attribute round-trip per date field
+                date_field_names = driver.execute_script(
+                    DATE_FIELD_NAMES_SCRIPT) or []
+                min_field_name = next((name for name in date_field_names if
+                    name and '_dva' in name), None)
                 
                 if not min_field_name:
                     return False
@@ -296,29 +629,17 @@ def search_cao_number(driver, cao_number):
                 random_delay(0.5, 1.0)
         else:
             return False
-        driver.execute_script('arguments[0].scrollIntoView(true);', date_field)
-        random_delay(0.5, 1.2)
         date_field.click()
-        random_delay(0.5, 1.2)
-        date_field.clear()
-        random_delay(0.5, 1.2)
         # Set MIN ingangsdatum to include all available documents
-        for char in MIN_INGANGSDATUM:
-            date_field.send_keys(char)
-            random_delay(0.08, 0.15)
-        random_delay(0.5, 1.2)
+        set_input_value(driver, date_field, MIN_INGANGSDATUM)
         
         # Now set MAX ingangsdatum to 2006 to get only pre-2006 documents
         for _ in range(2):
             try:
                 # Use name attribute to target the specific MAX ingangsdatum field
                 # Note: Field names change dynamically, so we need to find them at runtime
-                max_field_name = None
-                for field in all_date_fields:
-                    field_name = field.get_attribute('name')
-                    if field_name and '_dtm' in field_name:
-                        max_field_name = field_name
-                        break
+                max_field_name = next((name for name in date_field_names if
+                    name and '_dtm' in name), None)
                 
                 if not max_field_name:
                     return False
@@ -331,17 +652,9 @@ def search_cao_number(driver, cao_number):
                 random_delay(0.5, 1.0)
         else:
             return False
-        driver.execute_script('arguments[0].scrollIntoView(true);', max_date_field)
-        random_delay(0.5, 1.2)
         max_date_field.click()
-        random_delay(0.5, 1.2)
-        max_date_field.clear()
-        random_delay(0.5, 1.2)
         # Set MAX ingangsdatum to get only pre-2006 CAO documents
-        for char in MAX_INGANGSDATUM:
-            max_date_field.send_keys(char)
-            random_delay(0.08, 0.15)
-        random_delay(0.5, 1.2)
+        set_input_value(driver, max_date_field, MAX_INGANGSDATUM)
         for _ in range(2):
             try:
                 search_button = WebDriverWait(driver, 8).until(EC.
@@ -353,11 +666,12 @@ def search_cao_number(driver, cao_number):
                 random_delay(0.5, 1.0)
         else:
             return False
-        driver.execute_script('arguments[0].scrollIntoView(true);',
-            search_button)
-        random_delay(0.5, 1.2)
         search_button.click()
-        random_delay(2.0, 2.5)
+        try:
+            WebDriverWait(driver, 8).until(EC.presence_of_element_located((By
+                .CSS_SELECTOR, 'a.zaakregel__verwijzing')))
+        except TimeoutException:
+            pass
         return True
     except (TimeoutException, NoSuchElementException) as e:
         close_overlays(driver)
@@ -374,82 +688,144 @@ def search_cao_number(driver, cao_number):
         return False
 
 
-def extract_page_info(driver, cao_number, position):
+def get_page_data(driver):
+    """
+    Collect the page name, body text and PDF hrefs of the current page in a
+    single WebDriver round-trip.
+    Args:
+        driver (webdriver.Chrome): Selenium WebDriver instance.
+    Returns:
+        dict: Dictionary with 'pageName', 'bodyText' and 'pdfs' keys.
+    """
+    try:
+        return driver.execute_script(PAGE_DATA_SCRIPT)
+    except WebDriverException:
+        # Parse the page source locally if the script cannot run on this page
+        return parse_page_html(driver.page_source, driver.current_url) or {
+            'pageName': None, 'bodyText': '', 'pdfs': []}
+
+
+def parse_page_html(html, page_url):
+    """
+    Parse a detail page's HTML into the structure returned by get_page_data.
+    Args:
+        html (str): HTML source of the detail page.
+        page_url (str): URL of the page, used to resolve relative PDF links.
+    Returns:
+        dict or None: Page data, or None if the page has no title block.
+    """
+    soup = BeautifulSoup(html, 'lxml')
+    title = soup.select_one('div.aandachttekst__tekst > span')
+    if title is None:
+        return None
+    pdfs = []
+    for link in soup.select('a.link--nochevron'):
+        href = link.get('href')
+        if href:
+            href = urllib.parse.urljoin(page_url, href)
+            if href.endswith('.pdf'):
+                pdfs.append(href)
+    body = soup.body or soup
+    return {'pageName': title.get_text(), 'bodyText': body.get_text('\n'),
+        'pdfs': pdfs}
+
+
+def extract_page_info(driver, cao_number, page_data=None):
     """
     Extract metadata and PDF filename from the current page.
     Args:
         driver (webdriver.Chrome): Selenium WebDriver instance.
         cao_number (int or str): The CAO number being processed.
-        position (int): The position/index of the PDF for this CAO.
+        page_data (dict, optional): Result of get_page_data for the current page,
+            fetched here if not provided.
     Returns:
         dict: Dictionary with extracted metadata and PDF filename.
     """
-    info = {'cao_number': cao_number, 'id': f'{cao_number}{position:03d}',
+    info = {'cao_number': cao_number, 'id': '',
         'ingangsdatum': '', 'expiratiedatum': '', 'datum_kennisgeving': '',
         'pdf_name': '', 'page_name': ''}
     try:
-        try:
-            page_name_element = driver.find_element(By.CSS_SELECTOR,
-                'div.aandachttekst__tekst > span')
-            info['page_name'] = page_name_element.text.strip()
-        except NoSuchElementException:
-            pass
-        try:
-            page_text = driver.find_element(By.TAG_NAME, 'body').text
-        except:
-            page_text = driver.page_source
-        ingangs_patterns = ['Ingangsdatum\\s*:?\\s*(\\d{1,2}-\\d{1,2}-\\d{4})',
-            'Ingangsdatum\\s*:?\\s*(\\d{1,2}/\\d{1,2}/\\d{4})',
-            'Ingangsdatum\\s*:?\\s*(\\d{1,2}\\.\\d{1,2}\\.\\d{4})',
-            'Ingangsdatum\\s*:?\\s*(\\d{4}-\\d{1,2}-\\d{1,2})',
-            'Ingangsdatum\\s*:?\\s*(\\d{1,2}-\\d{1,2}-\\d{2})']
-        for pattern in ingangs_patterns:
-            ingangs_match = re.search(pattern, page_text, re.IGNORECASE)
-            if ingangs_match:
-                info['ingangsdatum'] = ingangs_match.group(1)
-                break
-        expiratie_patterns = [
-            'Expiratiedatum\\s*:?\\s*(\\d{1,2}-\\d{1,2}-\\d{4})',
-            'Expiratiedatum\\s*:?\\s*(\\d{1,2}/\\d{1,2}/\\d{4})',
-            'Expiratiedatum\\s*:?\\s*(\\d{1,2}\\.\\d{1,2}\\.\\d{4})',
-            'Expiratiedatum\\s*:?\\s*(\\d{4}-\\d{1,2}-\\d{1,2})',
-            'Expiratiedatum\\s*:?\\s*(\\d{1,2}-\\d{1,2}-\\d{2})']
-        for pattern in expiratie_patterns:
-            expiratie_match = re.search(pattern, page_text, re.IGNORECASE)
-            if expiratie_match:
-                info['expiratiedatum'] = expiratie_match.group(1)
-                break
-        kennisgeving_patterns = [
-            'Datum formele Kennisgeving van Ontvangst\\s*:?\\s*(\\d{1,2}-\\d{1,2}-\\d{4})'
-            ,
-            'Datum formele Kennisgeving van Ontvangst\\s*:?\\s*(\\d{1,2}/\\d{1,2}/\\d{4})'
-            ,
-            'Datum formele Kennisgeving van Ontvangst\\s*:?\\s*(\\d{1,2}\\.\\d{1,2}\\.\\d{4})'
-            ,
-            'Datum formele Kennisgeving van Ontvangst\\s*:?\\s*(\\d{4}-\\d{1,2}-\\d{1,2})'
-            ,
-            'Datum formele Kennisgeving van Ontvangst\\s*:?\\s*(\\d{1,2}-\\d{1,2}-\\d{2})'
-            , 'kvo datum\\s*:?\\s*(\\d{1,2}-\\d{1,2}-\\d{4})',
-            'kvo datum\\s*:?\\s*(\\d{1,2}/\\d{1,2}/\\d{4})']
-        for pattern in kennisgeving_patterns:
-            kennisgeving_match = re.search(pattern, page_text, re.IGNORECASE)
-            if kennisgeving_match:
-                info['datum_kennisgeving'] = kennisgeving_match.group(1)
-                break
-        pdf_links = driver.find_elements(By.CSS_SELECTOR, 'a.link--nochevron')
-        for link in pdf_links:
-            href = link.get_attribute('href')
-            if href and href.endswith('.pdf'):
-                parsed_url = urllib.parse.urlparse(href)
-                original_filename = os.path.basename(parsed_url.path)
-                original_filename = sanitize_filename(original_filename)
-                info['pdf_name'] = original_filename
-                break
+        if page_data is None:
+            page_data = get_page_data(driver)
+        info['page_name'] = (page_data.get('pageName') or '').strip()
+        # page_data may come from an HTTP fetch while the driver still shows the
+        # results list, so its page_source is not a valid fallback here
+        page_text = page_data.get('bodyText') or ''
+        kvo_date = ''
+        for match in PAGE_DATES_RE.finditer(page_text):
+            if match.group('kvo_date'):
+                kvo_date = kvo_date or match.group('kvo_date')
+                continue
+            field = DATE_LABEL_FIELDS[match.group('label').lower()]
+            # Keep the first occurrence of each label, as re.search did
+            if not info[field]:
+                info[field] = match.group('date')
+                # Stop scanning as soon as every date field has been found
+                if all(info[f] for f in DATE_LABEL_FIELDS.values()):
+                    break
+        # The formal notice label takes precedence over the shorter 'kvo datum'
+        if not info['datum_kennisgeving']:
+            info['datum_kennisgeving'] = kvo_date
+        pdf_hrefs = page_data.get('pdfs') or []
+        if pdf_hrefs:
+            parsed_url = urllib.parse.urlparse(pdf_hrefs[0])
+            original_filename = os.path.basename(parsed_url.path)
+            info['pdf_name'] = sanitize_filename(original_filename)
     except Exception as e:
-        print(f'    Error extracting page info: {e}')
+        logger.warning('    Error extracting page info: %s', e)
     return info
 
 
+def get_browser_session(driver):
+    """
+    Capture the browser's cookies and user agent so detail pages can be
+    fetched over plain HTTP within the same website session.
+    Args:
+        driver (webdriver.Chrome): Selenium WebDriver instance.
+    Returns:
+        dict: Dictionary with 'cookies' and 'headers' for http_session requests.
+    """
+    cookies = {c['name']: c['value'] for c in driver.get_cookies()}
+    user_agent = driver.execute_script('return navigator.userAgent')
+    return {'cookies': cookies, 'headers': {'User-Agent': user_agent}}
+
+
+def fetch_page_data(detail_url, browser_session):
+    """
+    Fetch a detail page over HTTP and parse it without the browser.
+    Args:
+        detail_url (str): URL of the detail page.
+        browser_session (dict): Cookies and headers from get_browser_session.
+    Returns:
+        dict or None: Same structure as get_page_data, or None if the page could
+            not be fetched or does not contain the expected server-rendered content.
+    """
+    try:
+        response = http_session.get(detail_url, cookies=browser_session[
+            'cookies'], headers=browser_session['headers'], timeout=30)
+        if response.status_code != 200:
+            return None
+        return parse_page_html(response.text, response.url)
+    except Exception:
+        return None
+
+
+def get_main_link_urls(driver, cao_number):
+    """
+    Return the detail page URLs listed for a CAO on the current results page.
+    All links are read with one script call and filtered on their label.
+    Args:
+        driver (webdriver.Chrome): Selenium WebDriver instance.
+        cao_number (int or str): The CAO number being processed.
+    Returns:
+        list: Detail page URLs whose link text starts with the CAO number.
+    """
+    label_re = re.compile(f'^{re.escape(str(cao_number))}[\\s\\-]')
+    main_links = driver.execute_script(MAIN_LINKS_SCRIPT) or []
+    return [link['href'] for link in main_links if link.get('href') and
+        label_re.match((link.get('text') or '').strip())]
+
+
 def extract_pdf_links(driver, cao_number):
     """
     Extract PDF links and associated metadata from the current CAO page.
@@ -463,6 +839,7 @@ def extract_pdf_links(driver, cao_number):
     pdf_links = []
     main_link_logs = []
     position = 1
+    cao_prefix = str(cao_number)
     for extraction_attempt in range(2):
         try:
             last_height = driver.execute_script(
@@ -470,155 +847,251 @@ def extract_pdf_links(driver, cao_number):
             while True:
                 driver.execute_script(
                     'window.scrollTo(0, document.body.scrollHeight);')
-                time.sleep(2)
-                new_height = driver.execute_script(
-                    'return document.body.scrollHeight')
-                if new_height == last_height:
+                try:
+                    WebDriverWait(driver, 2).until(lambda d: d.
+                        execute_script('return document.body.scrollHeight') !=
+                        last_height)
+                except TimeoutException:
                     break
-                last_height = new_height
+                last_height = driver.execute_script(
+                    'return document.body.scrollHeight')
             driver.execute_script('window.scrollTo(0, 0);')
-            time.sleep(1)
-            main_links = driver.find_elements(By.CSS_SELECTOR,
-                'a.zaakregel__verwijzing')
-            cao_number_str = str(cao_number)
-            filtered_main_links = []
-            for link in main_links:
-                text = link.text.strip()
-                if re.match(f'^{re.escape(cao_number_str)}[\\s\\-]', text):
-                    filtered_main_links.append(link)
-            main_links = filtered_main_links
-            main_link_urls = []
-            for link in main_links:
-                url = link.get_attribute('href')
-                if url:
-                    main_link_urls.append(url)
+            main_link_urls = get_main_link_urls(driver, cao_number)
             if not main_link_urls and extraction_attempt == 0:
-                time.sleep(3)
-                main_links = driver.find_elements(By.CSS_SELECTOR,
-                    'a.zaakregel__verwijzing')
-                cao_number_str = str(cao_number)
-                filtered_main_links = []
-                for link in main_links:
-                    text = link.text.strip()
-                    if re.match(f'^{re.escape(cao_number_str)}[\\s\\-]', text):
-                        filtered_main_links.append(link)
-                main_links = filtered_main_links
-                main_link_urls = [link.get_attribute('href') for link in
-                    main_links if link.get_attribute('href')]
+                try:
+                    WebDriverWait(driver, 3).until(EC.
+                        presence_of_element_located((By.CSS_SELECTOR,
+                        'a.zaakregel__verwijzing')))
+                except TimeoutException:
+                    pass
+                main_link_urls = get_main_link_urls(driver, cao_number)
+            browser_session = get_browser_session(driver)
+            http_failures = 0
             for main_link_url in main_link_urls:
                 pdf_found = False
                 found_pdf_name = ''
                 pdfs_found_count = 0
-                main_links = driver.find_elements(By.CSS_SELECTOR,
-                    'a.zaakregel__verwijzing')
-                link_to_click = None
-                for link in main_links:
-                    if link.get_attribute('href') == main_link_url:
-                        link_to_click = link
-                        break
-                if not link_to_click:
+                id_value = ''
+                cached = get_cached_page(cao_number, main_link_url)
+                if cached is not None:
+                    if cached['pdf_url'] and (MAX_PDFS_PER_CAO is None or len(
+                        pdf_links) < MAX_PDFS_PER_CAO):
+                        id_value = cao_prefix + str(position).zfill(3)
+                        page_info = dict(cached['page_info'])
+                        page_info['id'] = id_value
+                        pdf_links.append({'url': cached['pdf_url'],
+                            'description': cached['description'],
+                            'page_info': page_info})
+                        found_pdf_name = page_info['pdf_name']
+                        pdf_found = True
+                        position += 1
                     main_link_logs.append({'cao_number': cao_number,
-                        'main_link_url': main_link_url, 'pdf_found': False,
-                        'pdf_name': '', 'pdfs_found_count': 0, 'id': ''})
+                        'main_link_url': main_link_url, 'pdf_found':
+                        pdf_found, 'pdf_name': found_pdf_name,
+                        'pdfs_found_count': cached['pdfs_found_count'], 'id':
+                        id_value})
                     continue
                 try:
-                    driver.execute_script('arguments[0].scrollIntoView(true);',
-                        link_to_click)
-                    link_to_click.click()
-                    try:
-                        WebDriverWait(driver, 5).until(EC.
-                            presence_of_element_located((By.CSS_SELECTOR,
-                            'a.link--nochevron')))
-                    except TimeoutException:
-                        pass
-                    time.sleep(0.5)
-                    extracted_info = 'default_filename'
-                    try:
-                        attention_text_div = driver.find_element(By.
-                            CSS_SELECTOR, 'div.aandachttekst__tekst > span')
-                        extracted_info = attention_text_div.text
-                    except NoSuchElementException:
-                        pass
-                    nested_links = driver.find_elements(By.CSS_SELECTOR,
-                        'a.link--nochevron')
-                    pdf_urls = set()
-                    for nl in nested_links:
-                        href = nl.get_attribute('href')
-                        if href and href.endswith('.pdf'):
-                            pdf_urls.add(href)
-                    pdfs_found_count = len(pdf_urls)
-                    for nested_link in nested_links:
-                        if MAX_PDFS_PER_CAO is not None and len(pdf_links
-                            ) >= MAX_PDFS_PER_CAO:
-                            break
+                    page_data = None
+                    if http_failures < MAX_HTTP_PAGE_FAILURES:
+                        page_data = fetch_page_data(main_link_url,
+                            browser_session)
+                        http_failures = 0 if page_data else http_failures + 1
+                    if page_data is None:
+                        # Open the detail page directly; the URLs were collected
+                        # up front, so the results list is never re-rendered
+                        driver.get(main_link_url)
+                        # The title block renders on every detail page, so pages
+                        # without PDF links do not run into the timeout
                         try:
-                            href = nested_link.get_attribute('href')
-                            if href and href.endswith('.pdf'):
-                                parsed_url = urllib.parse.urlparse(href)
-                                original_filename = os.path.basename(parsed_url
-                                    .path)
-                                original_filename = sanitize_filename(
-                                    original_filename)
-                                page_info = extract_page_info(driver,
-                                    cao_number, position)
-                                page_info['pdf_name'] = original_filename
-                                page_info['main_link_url'] = main_link_url
-                                pdf_links.append({'url': href,
-                                    'description': extracted_info,
-                                    'page_info': page_info})
-                                found_pdf_name = original_filename
-                                pdf_found = True
-                                id_value = f'{cao_number}{position:03d}'
-                                position += 1
-                                break
-                        except Exception as e:
+                            WebDriverWait(driver, 5).until(EC.
+                                presence_of_element_located((By.CSS_SELECTOR,
+                                'a.link--nochevron, div.aandachttekst__tekst')))
+                        except TimeoutException:
                             pass
+                        page_data = get_page_data(driver)
+                    extracted_info = page_data.get('pageName')
+                    if extracted_info is None:
+                        extracted_info = 'default_filename'
+                    pdf_hrefs = page_data.get('pdfs') or []
+                    pdfs_found_count = len(set(pdf_hrefs))
+                    if pdf_hrefs and (MAX_PDFS_PER_CAO is None or len(
+                        pdf_links) < MAX_PDFS_PER_CAO):
+                        href = pdf_hrefs[0]
+                        parsed_url = urllib.parse.urlparse(href)
+                        original_filename = os.path.basename(parsed_url.path)
+                        original_filename = sanitize_filename(original_filename)
+                        id_value = cao_prefix + str(position).zfill(3)
+                        page_info = extract_page_info(driver, cao_number,
+                            page_data)
+                        page_info['id'] = id_value
+                        page_info['pdf_name'] = original_filename
+                        page_info['main_link_url'] = main_link_url
+                        pdf_links.append({'url': href, 'description':
+                            extracted_info, 'page_info': page_info})
+                        found_pdf_name = original_filename
+                        pdf_found = True
+                        position += 1
+                        store_cached_page(cao_number, main_link_url, href,
+                            extracted_info, page_info, pdfs_found_count)
+                    elif not pdf_hrefs:
+                        store_cached_page(cao_number, main_link_url, None,
+                            extracted_info, None, 0)
                     main_link_logs.append({'cao_number': cao_number,
                         'main_link_url': main_link_url, 'pdf_found':
                         pdf_found, 'pdf_name': found_pdf_name,
                         'pdfs_found_count': pdfs_found_count, 'id': id_value})
-                    driver.back()
-                    try:
-                        WebDriverWait(driver, 5).until(EC.
-                            presence_of_element_located((By.CSS_SELECTOR,
-                            'a.zaakregel__verwijzing')))
-                    except TimeoutException:
-                        pass
-                    time.sleep(0.5)
-                except StaleElementReferenceException:
-                    continue
                 except Exception as e:
-                    driver.back()
-                    time.sleep(3)
+                    logger.warning('    Failed to read detail page %s: %s',
+                        main_link_url, e)
                     continue
-            if pdf_links:
+            # Once detail pages were visited the driver has left the results
+            # list, so only retry when the list itself came back empty
+            if pdf_links or main_link_urls:
                 break
         except Exception as e:
             if extraction_attempt == 0:
-                print(
-                    f'    First extraction attempt failed for CAO {cao_number}, retrying...'
-                    )
-                time.sleep(2)
+                logger.warning(
+                    '    First extraction attempt failed for CAO %s, retrying...',
+                    cao_number)
+                try:
+                    WebDriverWait(driver, 5).until(EC.
+                        presence_of_element_located((By.CSS_SELECTOR,
+                        'a.zaakregel__verwijzing')))
+                except Exception:
+                    pass
             else:
-                print(
-                    f'    Both extraction attempts failed for CAO {cao_number}'
-                    )
+                logger.error('    Both extraction attempts failed for CAO %s',
+                    cao_number)
     return pdf_links, main_link_logs
 
 
-def save_extracted_data():
+def open_csv_appender(csv_path, columns):
     """
-    Save the extracted metadata for all processed PDFs to a CSV file in the output folder.
+    Open a semicolon-separated CSV file for appending rows as they are produced.
+    An existing header is reused; a new or empty file gets the given columns.
+    Args:
+        csv_path (str): Path of the CSV file.
+        columns (list): Column names to use when the file has no header yet.
     Returns:
-        pd.DataFrame or None: DataFrame of extracted data if any, else None.
+        tuple: (file object, csv.DictWriter) for the opened file.
+    """
+    fieldnames = columns
+    has_header = False
+    if os.path.exists(csv_path) and os.path.getsize(csv_path) > 0:
+        with open(csv_path, 'r', newline='', encoding='utf-8') as f:
+            header = next(csv.reader(f, delimiter=';'), None)
+        if header:
+            fieldnames = header
+            has_header = True
+    csv_file = open(csv_path, 'a', newline='', encoding='utf-8')
+    writer = csv.DictWriter(csv_file, fieldnames=fieldnames, delimiter=';',
+        extrasaction='ignore')
+    if not has_header:
+        writer.writeheader()
+        csv_file.flush()
+    return csv_file, writer
+
+
+def open_extracted_info_writer():
+    """
+    Open extracted_cao_info.csv for appending so rows can be written as soon as
+    each CAO finishes. Existing rows are kept and the existing header is reused.
+    """
+    global extracted_info_file, extracted_info_writer
+    extracted_info_file, extracted_info_writer = open_csv_appender(os.path.
+        join(OUTPUT_FOLDER, 'extracted_cao_info.csv'), EXTRACTED_INFO_COLUMNS)
+
+
+def save_extracted_data(rows):
+    """
+    Append the extracted metadata of newly downloaded PDFs to extracted_cao_info.csv
+    and flush it, so completed CAOs survive a crash later in the run.
+    Args:
+        rows (list): List of page_info dictionaries to write.
+    """
+    if not rows:
+        return
+    with _extracted_info_lock:
+        extracted_info_writer.writerows(rows)
+        extracted_info_file.flush()
+
+
+def close_extracted_info_writer():
+    """Close extracted_cao_info.csv if it was opened for appending."""
+    global extracted_info_file, extracted_info_writer
+    with _extracted_info_lock:
+        if extracted_info_file is not None:
+            extracted_info_file.close()
+            logger.info('📄 Extracted information saved to: %s', os.path.
+                join(OUTPUT_FOLDER, 'extracted_cao_info.csv'))
+        extracted_info_file = None
+        extracted_info_writer = None
+
+
+def open_main_link_log_writer():
+    """
+    Open main_links_log.csv for appending. The (cao_number, main_link_url, id)
+    keys already in the file are remembered so re-scraped links are not logged
+    twice.
     """
-    if extracted_data:
-        df = pd.DataFrame(extracted_data)
-        csv_path = os.path.join(OUTPUT_FOLDER, 'extracted_cao_info.csv')
-        df.to_csv(csv_path, index=False, encoding='utf-8', sep=';')
-        print(f'📄 Extracted information saved to: {csv_path}')
-        return df
-    return None
+    global main_link_log_file, main_link_log_writer
+    log_path = os.path.join(OUTPUT_FOLDER, 'main_links_log.csv')
+    logged_main_links.clear()
+    if os.path.exists(log_path):
+        with open(log_path, 'r', newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f, delimiter=';'):
+                logged_main_links.add((str(row.get('cao_number')), str(row.
+                    get('main_link_url')), str(row.get('id') or '')))
+    main_link_log_file, main_link_log_writer = open_csv_appender(log_path,
+        MAIN_LINK_LOG_COLUMNS)
+
+
+def save_main_link_logs(rows):
+    """
+    Append main link log rows that were not logged before to main_links_log.csv
+    and flush it.
+    Args:
+        rows (list): List of main link log dictionaries to write.
+    """
+    with _main_link_log_lock:
+        new_rows = []
+        for row in rows:
+            key = str(row.get('cao_number')), str(row.get('main_link_url')
+                ), str(row.get('id') or '')
+            if key not in logged_main_links:
+                logged_main_links.add(key)
+                new_rows.append(row)
+        if new_rows:
+            main_link_log_writer.writerows(new_rows)
+            main_link_log_file.flush()
+
+
+def close_main_link_log_writer():
+    """Close main_links_log.csv if it was opened for appending."""
+    global main_link_log_file, main_link_log_writer
+    with _main_link_log_lock:
+        if main_link_log_file is not None:
+            main_link_log_file.close()
+            logger.info('📄 Main link log saved to: %s', os.path.join(
+                OUTPUT_FOLDER, 'main_links_log.csv'))
+        main_link_log_file = None
+        main_link_log_writer = None
+
+
+def wait_for_search_slot():
+    """
+    Pace search page loads across all pooled drivers: each caller is given the
+    next free start time, at least SEARCH_INTERVAL seconds after the previous
+    one, and only sleeps if that time is still ahead.
+    """
+    global _next_search_time
+    with _search_pace_lock:
+        now = time.monotonic()
+        start = max(now, _next_search_time)
+        _next_search_time = start + SEARCH_INTERVAL
+    if start > now:
+        time.sleep(start - now)
 
 
 def process_cao_number(driver, cao_number):
@@ -626,51 +1099,52 @@ def process_cao_number(driver, cao_number):
     for attempt in range(MAX_RETRIES):
         attempts_needed = attempt + 1
         try:
+            wait_for_search_slot()
             driver.get(WEBSITE_URL)
-            time.sleep(2)
-            random_delay(0.5, 1.0)
+            try:
+                WebDriverWait(driver, 8).until(EC.presence_of_element_located(
+                    (By.ID, 'mZoekGmr')))
+            except TimeoutException:
+                pass
             if search_cao_number(driver, cao_number):
                 break
             else:
-                print(
-                    f'  Attempt {attempt + 1}/{MAX_RETRIES} failed for CAO {cao_number}'
-                    )
+                logger.warning('  Attempt %d/%d failed for CAO %s', attempt +
+                    1, MAX_RETRIES, cao_number)
                 # Debug screenshot removed to avoid cluttering the directory
                 pass
                 if attempt < MAX_RETRIES - 1:
                     time.sleep(2)
         except WebDriverException as e:
-            print(
-                f'  Attempt {attempt + 1}/{MAX_RETRIES} failed for CAO {cao_number}: {e}'
-                )
+            logger.warning('  Attempt %d/%d failed for CAO %s: %s', attempt +
+                1, MAX_RETRIES, cao_number, e)
             # Debug screenshot removed to avoid cluttering the directory
             pass
             if attempt < MAX_RETRIES - 1:
                 time.sleep(2)
         except Exception as e:
-            print(
-                f'  Attempt {attempt + 1}/{MAX_RETRIES} failed for CAO {cao_number}: {e}'
-                )
+            logger.warning('  Attempt %d/%d failed for CAO %s: %s', attempt +
+                1, MAX_RETRIES, cao_number, e)
             # Debug screenshot removed to avoid cluttering the directory
             pass
             if attempt < MAX_RETRIES - 1:
                 time.sleep(2)
     else:
-        print(
-            f'✗ Failed to search for CAO {cao_number} after {MAX_RETRIES} attempts'
-            )
+        logger.error('✗ Failed to search for CAO %s after %d attempts',
+            cao_number, MAX_RETRIES)
         return 0, [], []
     if attempts_needed > 1:
-        print(
-            f'  ✓ CAO {cao_number} succeeded after {attempts_needed} attempts')
+        logger.info('  ✓ CAO %s succeeded after %d attempts', cao_number,
+            attempts_needed)
     pdf_links, main_link_logs = extract_pdf_links(driver, cao_number)
     if not pdf_links:
-        print(f'  No PDFs found for CAO {cao_number}')
+        logger.info('  No PDFs found for CAO %s', cao_number)
         return 0, [], []
     cao_folder = os.path.join(OUTPUT_FOLDER, str(cao_number))
     os.makedirs(cao_folder, exist_ok=True)
-    existing_pdfs = set(f for f in os.listdir(cao_folder) if f.lower().
-        endswith('.pdf'))
+    with os.scandir(cao_folder) as entries:
+        existing_pdfs = {entry.name for entry in entries if entry.name.lower(
+            ).endswith('.pdf')}
     seen_urls = set()
     unique_pdf_links = []
     for link_info in pdf_links:
@@ -678,16 +1152,18 @@ def process_cao_number(driver, cao_number):
         if url not in seen_urls:
             seen_urls.add(url)
             unique_pdf_links.append(link_info)
-    print(
-        f'    Found {len(pdf_links)} PDF links, {len(unique_pdf_links)} unique URLs'
-        )
+    logger.info('    Found %d PDF links, %d unique URLs', len(pdf_links),
+        len(unique_pdf_links))
     skipped = 0
     downloaded_count = 0
-    downloaded_position = 1
     downloaded_data = []
     pdf_name_counts = {}
     cao_str = str(cao_number)
-    existing_ids = existing_ids_by_cao.get(cao_str, set())
+    # Per-CAO sets are created in the shared indexes so that ids and URLs
+    # recorded here are seen by later runs of this CAO as well
+    existing_ids = existing_ids_by_cao.setdefault(cao_str, set())
+    known_urls = existing_urls_by_cao.setdefault(cao_str, set())
+    logs_by_url = {log.get('main_link_url'): log for log in main_link_logs}
     max_id_num = 0
     for eid in existing_ids:
         if eid.startswith(cao_str):
@@ -698,16 +1174,17 @@ def process_cao_number(driver, cao_number):
             except:
                 pass
     position = max_id_num + 1
+    pending_links = []
     for link_info in unique_pdf_links:
-        if (MAX_PDFS_PER_CAO is not None and downloaded_count >=
+        if (MAX_PDFS_PER_CAO is not None and len(pending_links) >=
             MAX_PDFS_PER_CAO):
             break
         pdf_name = link_info['page_info'].get('pdf_name')
         if pdf_name is None:
-            print(
-                f"[FATAL] pdf_name is None for CAO {cao_number}, main_link_url: {link_info['page_info'].get('main_link_url', 'N/A')}"
-                )
-            print(f'         link_info: {link_info}')
+            logger.error(
+                '[FATAL] pdf_name is None for CAO %s, main_link_url: %s',
+                cao_number, link_info['page_info'].get('main_link_url', 'N/A'))
+            logger.error('         link_info: %s', link_info)
             continue
         base_name, ext = os.path.splitext(pdf_name)
         count = pdf_name_counts.get(pdf_name, 0)
@@ -719,45 +1196,93 @@ def process_cao_number(driver, cao_number):
         else:
             new_pdf_name = pdf_name
         link_info['page_info']['pdf_name'] = new_pdf_name
-        for log in main_link_logs:
-            if log.get('main_link_url') == link_info['page_info'].get(
-                'main_link_url'):
-                log['pdf_name'] = new_pdf_name
         # Check if URL was already downloaded (more reliable than PDF name)
         main_link_url = link_info['page_info'].get('main_link_url', '')
-        if main_link_url in existing_urls_by_cao.get(cao_str, set()):
+        if main_link_url in logs_by_url:
+            logs_by_url[main_link_url]['pdf_name'] = new_pdf_name
+        if main_link_url in known_urls:
+            skipped += 1
+            continue
+        pending_links.append(link_info)
+    # Fan the downloads out over the shared download pool; results are
+    # consumed in submission order so ids stay deterministic
+    futures = [_download_executor.submit(download_pdf, link_info['url'],
+        link_info['description'], cao_folder, existing_pdfs) for link_info in
+        pending_links]
+    for link_info, future in zip(pending_links, futures):
+        new_pdf_name = link_info['page_info']['pdf_name']
+        main_link_url = link_info['page_info'].get('main_link_url', '')
+        success = future.result()
+        if success is PDF_REUSED:
+            # Already on disk from an earlier run: no new id or CSV row
+            logger.info('    ♻️ Reusing existing PDF: %s', new_pdf_name)
             skipped += 1
+            if main_link_url:
+                existing_urls_by_cao.setdefault(cao_str, set()).add(main_link_url)
             continue
-        success = download_pdf(link_info['url'], link_info['description'],
-            cao_folder)
         if success:
-            print(f'    ⬇️ Downloaded PDF: {new_pdf_name}')
+            logger.info('    ⬇️ Downloaded PDF: %s', new_pdf_name)
             downloaded_count += 1
-            existing_pdfs.add(new_pdf_name)
             existing_pdf_names_by_cao.setdefault(cao_str, set()).add(
                 new_pdf_name)
             # Also track the URL for future duplicate detection
             if main_link_url:
-                existing_urls_by_cao.setdefault(cao_str, set()).add(main_link_url)
-            new_id = f'{cao_str}{position:03d}'
+                known_urls.add(main_link_url)
+            new_id = cao_str + str(position).zfill(3)
             while new_id in existing_ids:
                 position += 1
-                new_id = f'{cao_str}{position:03d}'
+                new_id = cao_str + str(position).zfill(3)
             page_info = link_info['page_info']
             page_info['id'] = new_id
             existing_ids.add(new_id)
             position += 1
             downloaded_data.append(page_info)
         else:
-            print(f'    ✗ Failed to download PDF: {new_pdf_name}')
-        time.sleep(DOWNLOAD_DELAY)
-    print(
-        f'  Downloaded {downloaded_count} new PDFs for CAO {cao_number} (skipped {skipped})'
-        )
-    update_progress(cao_number, 'pdfs_found', successful=downloaded_count)
+            logger.warning('    ✗ Failed to download PDF: %s', new_pdf_name)
+    logger.info('  Downloaded %d new PDFs for CAO %s (skipped %d)',
+        downloaded_count, cao_number, skipped)
+    with _progress_lock:
+        update_progress(cao_number, 'pdfs_found', successful=downloaded_count)
     return downloaded_count, downloaded_data, main_link_logs
 
 
+def process_cao_with_pool(driver_pool, cao_number):
+    """
+    Process a single CAO with a driver checked out of the shared pool.
+    The driver is returned to the pool afterwards; a driver whose session died
+    is replaced by a fresh one so the pool keeps its size. If Chrome cannot be
+    restarted, None is put back instead and the next checkout retries the
+    start-up, so the pool never hands out a dead driver.
+    Args:
+        driver_pool (queue.Queue): Pool of reusable Chrome WebDriver instances (None for a slot whose driver could not be started).
+        cao_number (int): The CAO number to process.
+    Returns:
+        tuple: (downloaded_count, downloaded_data, main_link_logs) as returned by process_cao_number.
+    """
+    driver = driver_pool.get()
+    if driver is None:
+        try:
+            driver = setup_chrome_driver()
+        except Exception:
+            driver_pool.put(None)
+            raise
+    try:
+        return process_cao_number(driver, cao_number)
+    except WebDriverException:
+        try:
+            driver.quit()
+        except:
+            pass
+        try:
+            driver = setup_chrome_driver()
+        except Exception as e:
+            logger.error('✗ Could not restart Chrome driver: %s', e)
+            driver = None
+        raise
+    finally:
+        driver_pool.put(driver)
+
+
 def sync_excels_with_pdfs():
     """
     Remove rows from extracted_cao_info.csv and main_links_log.csv if the corresponding PDF file does not exist in the CAO folder.
@@ -768,7 +1293,7 @@ def sync_excels_with_pdfs():
     info_path = os.path.join(OUTPUT_FOLDER, 'extracted_cao_info.csv')
     log_path = os.path.join(OUTPUT_FOLDER, 'main_links_log.csv')
     if not os.path.exists(info_path):
-        print('No extracted_cao_info.csv found. Nothing to sync.')
+        logger.info('No extracted_cao_info.csv found. Nothing to sync.')
         return
     info_df = pd.read_csv(info_path, sep=';', dtype={'id': str})
     if os.path.exists(log_path):
@@ -777,32 +1302,38 @@ def sync_excels_with_pdfs():
         log_df = None
     keep_rows = []
     removed_rows = []
+    # Normalized file names per CAO folder, listed once per folder
+    folder_files = {}
     for idx, row in info_df.iterrows():
         cao = str(row['cao_number']).strip()
         pdf_name = str(row['pdf_name']).strip()
         folder = os.path.join(OUTPUT_FOLDER, cao)
-        if os.path.exists(folder):
-            files = [f for f in os.listdir(folder) if os.path.isfile(os.
-                path.join(folder, f))]
-            files_norm = {f.lower().strip(): f for f in files}
+        if folder not in folder_files:
+            if os.path.isdir(folder):
+                with os.scandir(folder) as entries:
+                    folder_files[folder] = {entry.name.lower().strip() for
+                        entry in entries if entry.is_file()}
+            else:
+                folder_files[folder] = None
+        files_norm = folder_files[folder]
+        if files_norm is not None:
             pdf_name_norm = pdf_name.lower().strip()
             if pdf_name_norm in files_norm:
                 keep_rows.append(idx)
             else:
                 removed_rows.append((cao, pdf_name))
-                print(
-                    f'[SYNC] Missing PDF: {os.path.join(folder, pdf_name)} (removing row)'
-                    )
+                logger.info('[SYNC] Missing PDF: %s (removing row)', os.path
+                    .join(folder, pdf_name))
         else:
             removed_rows.append((cao, pdf_name))
-            print(
-                f'[SYNC] Missing folder: {folder} (removing row for {pdf_name})'
-                )
+            logger.info('[SYNC] Missing folder: %s (removing row for %s)',
+                folder, pdf_name)
     info_df = info_df.loc[keep_rows].reset_index(drop=True)
     if 'id' in info_df.columns and isinstance(info_df['id'], pd.Series):
         info_df['id'] = info_df['id'].fillna('').astype(str)
     info_df.to_csv(info_path, index=False, encoding='utf-8', sep=';')
-    print(f'[SYNC] Updated {info_path}, removed {len(removed_rows)} rows.')
+    logger.info('[SYNC] Updated %s, removed %d rows.', info_path, len(
+        removed_rows))
     if (log_df is not None and not log_df.empty and 'pdf_name' in log_df.
         columns and 'cao_number' in log_df.columns):
         valid_pairs = set(zip(info_df['cao_number'].astype(str).str.strip(),
@@ -819,77 +1350,134 @@ def sync_excels_with_pdfs():
         if 'id' in log_df.columns:
             log_df['id'] = pd.Series(log_df['id']).fillna('').astype(str)
         log_df.to_csv(log_path, index=False, encoding='utf-8', sep=';')
-        print(f'[SYNC] Updated {log_path}, removed {len(removed_log)} rows.')
+        logger.info('[SYNC] Updated %s, removed %d rows.', log_path, len(
+            removed_log))
 
 
-if __name__ == '__main__':
+def read_needed_cao_numbers(excel_path):
+    """
+    Read the CAO numbers marked 'Yes' in the 'Needed?' column of the input Excel.
+    Rows are streamed from a read-only workbook instead of loading a DataFrame.
+    Args:
+        excel_path (str): Path to the CAO frequencies Excel file.
+    Returns:
+        list: CAO numbers (int) to process, in sheet order.
+    """
+    wb = load_workbook(excel_path, read_only=True, data_only=True)
+    try:
+        rows = wb.active.iter_rows(values_only=True)
+        header = next(rows)
+        needed_idx = header.index('Needed?')
+        cao_idx = header.index('CAO')
+        return [int(row[cao_idx]) for row in rows if row[needed_idx] ==
+            'Yes' and row[cao_idx] is not None]
+    finally:
+        wb.close()
+
+
+def setup_logging(level=logging.INFO):
+    """
+    Route log records through a queue so worker threads only enqueue them and
+    a single background listener writes to stdout.
+    Args:
+        level (int): Logging level for this module's logger.
+    Returns:
+        logging.handlers.QueueListener: The started listener; stop it at shutdown.
+    """
+    log_queue = queue.Queue()
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter('%(message)s'))
+    listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger.setLevel(level)
+    logger.propagate = False
+    listener.start()
+    return listener
+
+
+def main():
+    """Main entry point for the web scraping pipeline."""
+    parser = argparse.ArgumentParser(description='CAO PDF web scraping')
+    parser.add_argument('--force-refresh', action='store_true', help=
+        'Ignore the detail-page cache and re-scrape every CAO page')
+    args = parser.parse_args()
+    log_listener = setup_logging()
+    try:
+        run_scraper(args)
+    finally:
+        log_listener.stop()
+
+
+def run_scraper(args):
+    """
+    Run the full scraping flow: sync existing outputs, scrape all needed CAOs
+    with the driver pool, and write the CSV outputs.
+    Args:
+        args (argparse.Namespace): Parsed command line arguments.
+    """
     sync_excels_with_pdfs()
     os.makedirs(OUTPUT_FOLDER, exist_ok=True)
     try:
-        df = pd.read_excel(INPUT_EXCEL_PATH)
-        cao_series = pd.Series(df[df['Needed?'] == 'Yes']['CAO'])
-        cao_numbers = cao_series.dropna().astype(int).tolist()
-        print(
-            f'📋 Found {len(cao_numbers)} CAO numbers to process: {cao_numbers}'
-            )
+        cao_numbers = read_needed_cao_numbers(INPUT_EXCEL_PATH)
+        logger.info('📋 Found %d CAO numbers to process: %s', len(
+            cao_numbers), cao_numbers)
     except Exception as e:
-        print(f'✗ Error reading Excel file: {e}')
+        logger.error('✗ Error reading Excel file: %s', e)
         exit(1)
     if not cao_numbers:
-        print("✗ No CAO numbers found with 'Yes' in Needed? column")
+        logger.error("✗ No CAO numbers found with 'Yes' in Needed? column")
         exit(1)
     total_downloaded = 0
-    for i, cao_number in enumerate(cao_numbers, 1):
-        print(f'\n📄 Processing {i}/{len(cao_numbers)}: CAO {cao_number}')
-        driver = None
-        try:
-            driver = setup_chrome_driver()
-            downloaded, downloaded_data, main_link_logs = process_cao_number(
-                driver, cao_number)
-            if downloaded is None:
-                downloaded = 0
-            total_downloaded += int(downloaded)
-            extracted_data.extend(downloaded_data)
-            all_main_link_logs.extend(main_link_logs)
-            if i < len(cao_numbers):
-                time.sleep(DOWNLOAD_DELAY)
-        except Exception as e:
-            print(f'✗ Error processing CAO {cao_number}: {e}')
-        finally:
-            if driver:
+    total_extracted = 0
+    num_drivers = min(NUM_DRIVERS, len(cao_numbers))
+    driver_pool = queue.Queue()
+    open_page_cache(force_refresh=args.force_refresh)
+    open_extracted_info_writer()
+    open_main_link_log_writer()
+    try:
+        for _ in range(num_drivers):
+            driver_pool.put(setup_chrome_driver())
+        logger.info('🚗 Started %d Chrome drivers', num_drivers)
+        with ThreadPoolExecutor(max_workers=num_drivers) as executor:
+            futures = {executor.submit(process_cao_with_pool, driver_pool,
+                cao_number): cao_number for cao_number in cao_numbers}
+            for i, future in enumerate(as_completed(futures), 1):
+                cao_number = futures[future]
+                logger.info('\n📄 Finished %d/%d: CAO %s', i, len(
+                    cao_numbers), cao_number)
                 try:
+                    downloaded, downloaded_data, main_link_logs = future.result()
+                    if downloaded is None:
+                        downloaded = 0
+                    total_downloaded += int(downloaded)
+                    save_extracted_data(downloaded_data)
+                    total_extracted += len(downloaded_data)
+                    save_main_link_logs(main_link_logs)
+                    save_downloaded_urls()
+                except Exception as e:
+                    logger.error('✗ Error processing CAO %s: %s',
+                        cao_number, e)
+    finally:
+        while not driver_pool.empty():
+            try:
+                driver = driver_pool.get_nowait()
+                if driver is not None:
                     driver.quit()
-                except:
-                    pass
-    if extracted_data or existing_info_df is not None:
-        if existing_info_df is not None:
-            df = pd.concat([existing_info_df, pd.DataFrame(extracted_data)],
-                ignore_index=True)
-            df = df.drop_duplicates(subset=['cao_number', 'pdf_name', 'id'])
-        else:
-            df = pd.DataFrame(extracted_data)
-        if not df.empty and 'id' in df.columns and isinstance(df['id'], pd.
-            Series):
-            df['id'] = df['id'].fillna('').astype(str)
-        csv_path = os.path.join(OUTPUT_FOLDER, 'extracted_cao_info.csv')
-        df.to_csv(csv_path, index=False, encoding='utf-8', sep=';')
-        print(f'📄 Extracted information saved to: {csv_path}')
-    if all_main_link_logs or existing_log_df is not None:
-        if existing_log_df is not None:
-            df_log = pd.concat([existing_log_df, pd.DataFrame(
-                all_main_link_logs)], ignore_index=True)
-            df_log = df_log.drop_duplicates(subset=['cao_number',
-                'main_link_url', 'id'])
-        else:
-            df_log = pd.DataFrame(all_main_link_logs)
-        if not df_log.empty and 'id' in df_log.columns and isinstance(df_log
-            ['id'], pd.Series):
-            df_log['id'] = df_log['id'].fillna('').astype(str)
-        log_path = os.path.join(OUTPUT_FOLDER, 'main_links_log.csv')
-        df_log.to_csv(log_path, index=False, encoding='utf-8', sep=';')
-        print(f'📄 Main link log saved to: {log_path}')
-    print(f'\n✅ Download process completed!')
-    print(f'📊 Total PDFs downloaded: {total_downloaded}')
-    print(f'📁 Files saved in: {os.path.abspath(OUTPUT_FOLDER)}')
-    if extracted_data:
-        print(f'📋 Extracted information for {len(extracted_data)} PDFs')
+            except:
+                pass
+        for profile_dir in _chrome_profile_dirs:
+            shutil.rmtree(profile_dir, ignore_errors=True)
+        _download_executor.shutdown(wait=True)
+        close_page_cache()
+        close_extracted_info_writer()
+        close_main_link_log_writer()
+        save_downloaded_urls()
+    logger.info('\n✅ Download process completed!')
+    logger.info('📊 Total PDFs downloaded: %d', total_downloaded)
+    logger.info('📁 Files saved in: %s', os.path.abspath(OUTPUT_FOLDER))
+    if total_extracted:
+        logger.info('📋 Extracted information for %d PDFs', total_extracted)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,10 +1,43 @@
 import pandas as pd
 import yaml
+from openpyxl import load_workbook
 
 # =========================
 # Load and Process Excel Files
 # =========================
 
+def dataframe_to_markdown(df):
+    """
+    Build a markdown table from a DataFrame. Empty (NaN) cells become empty
+    strings; cells are converted and stripped column-wise instead of per cell.
+    """
+    markdown = "| " + " | ".join([str(col).strip() for col in df.columns]) + " |\n"
+    markdown += "| " + " | ".join(["---"] * len(df.columns)) + " |\n"
+    cells = df.astype(object).where(df.notna(), "").astype(str)
+    cells = cells.apply(lambda column: column.str.strip())
+    for row in cells.values.tolist():
+        markdown += "| " + " | ".join(row) + " |\n"
+    return markdown
+
+def read_excel_sheets(path, max_rows=None):
+    """
+    Read every sheet of a workbook into a header-less DataFrame (like
+    pd.read_excel(header=None, sheet_name=None)) by streaming cell values from a
+    read-only openpyxl workbook instead of loading the full workbook DOM.
+    Trailing empty rows are dropped. If max_rows is given, reading stops there.
+    """
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        sheets = {}
+        for ws in wb.worksheets:
+            rows = [list(row) for row in ws.iter_rows(values_only=True, max_row=max_rows)]
+            while rows and all(value is None for value in rows[-1]):
+                rows.pop()
+            sheets[ws.title] = pd.DataFrame(rows)
+        return sheets
+    finally:
+        wb.close()
+
 # Load configuration
 with open('conf/config.yaml', 'r') as f:
     config = yaml.safe_load(f)
@@ -12,7 +45,7 @@ with open('conf/config.yaml', 'r') as f:
 # === Load Excel ===
 excel_path = f"{config['paths']['inputs_excel']}/250702 AI information matrix.xlsx"
 # Load all sheets
-excel_sheets = pd.read_excel(excel_path, header=None, sheet_name=None)
+excel_sheets = read_excel_sheets(excel_path)
 
 # Process first sheet (default behavior)
 df = list(excel_sheets.values())[0]
@@ -20,11 +53,7 @@ df.columns = df.iloc[0]
 df = df[1:].reset_index(drop=True)
 
 # Build markdown table as string for sheet 1
-markdown = "| " + " | ".join([str(col).strip() for col in df.columns]) + " |\n"
-markdown += "| " + " | ".join(["---"] * len(df.columns)) + " |\n"
-for _, row in df.iterrows():
-    line = "| " + " | ".join([str(row[col]).strip() if bool(pd.notna(row[col])) else "" for col in df.columns]) + " |"
-    markdown += line + "\n"
+markdown = dataframe_to_markdown(df)
 
 with open(f"{config['paths']['docs']}/fields_prompt.md", "w", encoding="utf-8") as f:
     f.write(markdown)
@@ -36,11 +65,7 @@ for idx, sheet_name in enumerate(list(excel_sheets.keys())[:3]):
     df_sheet = excel_sheets[sheet_name]
     df_sheet.columns = df_sheet.iloc[0]
     df_sheet = df_sheet[1:].reset_index(drop=True)
-    markdown_sheet = "| " + " | ".join([str(col).strip() for col in df_sheet.columns]) + " |\n"
-    markdown_sheet += "| " + " | ".join(["---"] * len(df_sheet.columns)) + " |\n"
-    for _, row in df_sheet.iterrows():
-        line = "| " + " | ".join([str(row[col]).strip() if bool(pd.notna(row[col])) else "" for col in df_sheet.columns]) + " |"
-        markdown_sheet += line + "\n"
+    markdown_sheet = dataframe_to_markdown(df_sheet)
     out_filename = f"{config['paths']['docs']}/{sheet_filenames[idx]}"
     with open(out_filename, "w", encoding="utf-8") as f:
         f.write(markdown_sheet)
@@ -48,19 +73,15 @@ for idx, sheet_name in enumerate(list(excel_sheets.keys())[:3]):
 
 # === Load collapsed Excel ===
 collapsed_excel_path = f"{config['paths']['inputs_excel']}/250702 AI information matrix collapsed.xlsx"
-df_collapsed = pd.read_excel(collapsed_excel_path, header=None)
+# Only the header row and the single data row are used, so stop reading there
+df_collapsed = list(read_excel_sheets(collapsed_excel_path, max_rows=2).values())[0]
 
 # First row = column names, second row = only data row
 df_collapsed.columns = df_collapsed.iloc[0]
 df_collapsed = df_collapsed[1:2].reset_index(drop=True)
 
 # Build markdown table as string for collapsed
-markdown_collapsed = "| " + " | ".join([str(col).strip() for col in df_collapsed.columns]) + " |\n"
-markdown_collapsed += "| " + " | ".join(["---"] * len(df_collapsed.columns)) + " |\n"
-
-for _, row in df_collapsed.iterrows():
-    line = "| " + " | ".join([str(row[col]).strip() if bool(pd.notna(row[col])) else "" for col in df_collapsed.columns]) + " |"
-    markdown_collapsed += line + "\n"
+markdown_collapsed = dataframe_to_markdown(df_collapsed)
 
 # Save collapsed markdown to file
 with open(f"{config['paths']['docs']}/fields_prompt_collapsed.md", "w", encoding="utf-8") as f:
@@ -1,20 +1,29 @@
 import os
 import sys
-import json
+import orjson
+import io
+import hashlib
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 # Add the parent directory to Python path so we can import utils
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from PyPDF2 import PdfReader
+import pypdfium2 as pdfium
 from pdf2image import convert_from_path
 import pytesseract
-import pdfplumber
+# tesserocr keeps one Tesseract instance loaded per process instead of starting
+# a tesseract subprocess per page; pytesseract is used when it is not installed
+try:
+    from tesserocr import PyTessBaseAPI
+except ImportError:
+    PyTessBaseAPI = None
 from utils.OUTPUT_tracker import update_progress
 import traceback
 DEBUG_LOG_FILE = 'extraction_debug.log'
 DEBUG = False
-images = False
+images = False  # Save every OCR'd page as a PNG in debug_images/ (slow; debugging only)
 import logging
 logging.getLogger('pdfminer').setLevel(logging.ERROR)
 import yaml
@@ -22,224 +31,348 @@ with open('conf/config.yaml', 'r') as f:
     config = yaml.safe_load(f)
 INPUT_FOLDER = config['paths']['inputs_pdfs']
 OUTPUT_FOLDER = config['paths']['outputs_json']
+# Extraction results keyed by the SHA-256 of the PDF bytes (plus the cache
+# version and settings), so identical PDFs (renamed, or shared between CAOs)
+# are only extracted once
+CACHE_FOLDER = os.path.join(os.path.dirname(config['paths']['parsed_pdfs']),
+    'extraction_cache')
+# Number of PDFs extracted in parallel; each worker runs single-threaded OCR
+EXTRACT_WORKERS = os.cpu_count() or 1
+# Native text length from which an image page is not OCR'd
+MIN_NATIVE_CHARS = 50
+# Part of every extraction cache key together with the settings that shape the
+# output; bump it whenever extract_text_from_pdf returns different pages for
+# the same PDF bytes, so stale cache entries are no longer served
+EXTRACTION_CACHE_VERSION = 3
+# Maximum consecutive pages rasterized by a single Poppler call
+OCR_BATCH_PAGES = 10
+# Rendering resolution for OCR pages (pdf2image's default)
+OCR_DPI = 200
 
 
-def extract_text_from_pdf(pdf_path):
+def page_has_images(page, max_depth=3):
+    """
+    Check whether a PyPDF2 page draws any image, by inspecting the image
+    XObjects in its resources instead of building a full layout model.
+    Form XObjects are searched recursively up to max_depth levels.
+    Args:
+        page: PyPDF2 page object (or form XObject) to inspect.
+        max_depth (int): Maximum nesting of form XObjects to follow.
+    Returns:
+        bool: True if an image XObject is found.
+    """
+    resources = page.get('/Resources')
+    if resources is None:
+        return False
+    xobjects = resources.get_object().get('/XObject')
+    if xobjects is None:
+        return False
+    for xobject in xobjects.get_object().values():
+        xobject = xobject.get_object()
+        subtype = xobject.get('/Subtype')
+        if subtype == '/Image':
+            return True
+        if subtype == '/Form' and max_depth > 0 and page_has_images(xobject,
+            max_depth - 1):
+            return True
+    return False
+
+
+_tess_api = None
+
+
+def ocr_image(image):
+    """
+    Run Tesseract OCR on a rendered page image.
+    Uses a per-process tesserocr API when available, so the language model is
+    loaded once per worker instead of once per page. The grayscale pixel buffer
+    is handed over as raw bytes, without encoding the image first.
+    Args:
+        image (PIL.Image.Image): The rendered page.
+    Returns:
+        str: The recognized text, stripped.
+    """
+    global _tess_api
+    if PyTessBaseAPI is None:
+        return pytesseract.image_to_string(image).strip()
+    if _tess_api is None:
+        _tess_api = PyTessBaseAPI()
+    if image.mode != 'L':
+        image = image.convert('L')
+    _tess_api.SetImageBytes(image.tobytes(), image.width, image.height, 1,
+        image.width)
+    _tess_api.SetSourceResolution(OCR_DPI)
+    return (_tess_api.GetUTF8Text() or '').strip()
+
+
+def contiguous_page_runs(page_indices, max_run_length):
+    """
+    Group sorted page indices into runs of consecutive pages.
+    Args:
+        page_indices (list): Sorted 0-based page indices.
+        max_run_length (int): Maximum number of pages per run.
+    Returns:
+        list: (first, last) index pairs, inclusive.
+    """
+    runs = []
+    for index in page_indices:
+        if runs:
+            first, last = runs[-1]
+            if index == last + 1 and index - first < max_run_length:
+                runs[-1] = first, index
+                continue
+        runs.append((index, index))
+    return runs
+
+
+def extract_native_text(pdfium_pdf, reader_page, page_index):
+    """
+    Extract the native text of a page with PDFium, falling back to PyPDF2 when
+    the document could not be opened by PDFium or the page is missing there.
+    Args:
+        pdfium_pdf (pdfium.PdfDocument or None): The PDF opened with PDFium.
+        reader_page: The same page as a PyPDF2 page object.
+        page_index (int): 0-based page index.
+    Returns:
+        str: The page text, stripped.
+    """
+    if pdfium_pdf is not None and page_index < len(pdfium_pdf):
+        page = pdfium_pdf[page_index]
+        textpage = page.get_textpage()
+        try:
+            text = textpage.get_text_range()
+        finally:
+            textpage.close()
+            page.close()
+        return text.replace('\r\n', '\n').strip()
+    return (reader_page.extract_text() or '').strip()
+
+
+def extract_text_from_pdf(pdf_path, pdf_bytes=None):
     """
     Extraction logic per page:
-    1. If pdfplumber detects an image, use OCR.
-    2. Else if PyPDF2 finds text, use the extracted text.
+    1. If the page's resources contain an image and it has fewer than
+       MIN_NATIVE_CHARS characters of native text, use OCR.
+    2. Else if the page has native text, use the extracted text.
     3. Else (no image and no text), use OCR as a fallback.
-    Loops over the maximum number of pages found by either library.
+    Pages that need OCR are rasterized together in runs of consecutive pages.
+    If pdf_bytes is given, PyPDF2 and PDFium parse it instead of re-reading
+    the file.
     """
     if DEBUG:
         print(f'[DEBUG] Attempting to open PDF: {pdf_path}')
     try:
-        reader = PdfReader(pdf_path)
+        if pdf_bytes is None:
+            with open(pdf_path, 'rb') as f:
+                pdf_bytes = f.read()
+        # strict=False tolerates the minor xref/structure errors common in
+        # scanned PDFs instead of validating and rejecting them
+        reader = PdfReader(io.BytesIO(pdf_bytes), strict=False)
     except Exception as e:
         if DEBUG:
             print(f'[DEBUG] Failed to open PDF {pdf_path}: {e}')
         return []
+    # PDFium (C++) extracts native text much faster than PyPDF2; PyPDF2 is
+    # still used for the image check and as a text fallback
     try:
-        plumber_pdf = pdfplumber.open(pdf_path)
+        pdfium_pdf = pdfium.PdfDocument(pdf_bytes)
     except Exception as e:
         if DEBUG:
-            print(f'[DEBUG] Failed to open PDF with pdfplumber {pdf_path}: {e}'
-                )
-        plumber_pdf = None
-    num_pages = max(len(reader.pages), len(plumber_pdf.pages) if
-        plumber_pdf else 0)
+            print(f'[DEBUG] PDFium failed to open {pdf_path}: {e}')
+        pdfium_pdf = None
     pages = []
-    for i in range(num_pages):
+    ocr_pages = []
+    for i, page in enumerate(reader.pages):
         if DEBUG:
             print(f'[DEBUG] --- Processing page {i + 1} of {pdf_path} ---')
-        page_info = {'page': i + 1, 'ocr_used': False, 'text': ''}
-        if i < len(reader.pages):
-            try:
-                normal_text = reader.pages[i].extract_text() or ''
-                normal_text = normal_text.strip()
-                if DEBUG:
-                    print(
-                        f'[DEBUG] PyPDF2 text extraction done for page {i + 1}'
-                        )
-            except Exception as e:
-                if DEBUG:
-                    print(
-                        f'[DEBUG] PyPDF2 text extraction failed for page {i + 1}: {e}'
-                        )
-                normal_text = ''
-        else:
+        try:
+            normal_text = extract_native_text(pdfium_pdf, page, i)
+            if DEBUG:
+                print(f'[DEBUG] Native text extraction done for page {i + 1}')
+        except Exception as e:
+            if DEBUG:
+                print(
+                    f'[DEBUG] Native text extraction failed for page {i + 1}: {e}'
+                    )
             normal_text = ''
-        has_images = False
-        if plumber_pdf and i < len(plumber_pdf.pages):
-            try:
-                plumber_page = plumber_pdf.pages[i]
-                im_objs = plumber_page.images
-                has_images = len(im_objs) > 0
-                if DEBUG:
-                    print(
-                        f'[DEBUG] pdfplumber found {len(im_objs)} images on page {i + 1}'
-                        )
-            except Exception as e:
-                if DEBUG:
-                    print(f'[DEBUG] pdfplumber failed for page {i + 1}: {e}')
-                has_images = False
-        ocr_text = ''
-        used_ocr = False
-        if has_images:
+        try:
+            has_images = page_has_images(page)
             if DEBUG:
                 print(
-                    f'    [DEBUG] Image detected, using OCR for {pdf_path}, page {i + 1}'
+                    f'[DEBUG] Image XObjects found on page {i + 1}: {has_images}'
                     )
-            try:
-                if DEBUG:
-                    print(
-                        f'    [DEBUG] Calling convert_from_path for page {i + 1}'
-                        )
-                images_list = convert_from_path(pdf_path, first_page=i + 1,
-                    last_page=i + 1)
-                if DEBUG:
-                    print(
-                        f'    [DEBUG] images_list created, length: {len(images_list)}'
-                        )
-                if images_list:
-                    if DEBUG:
-                        print(
-                            f'    [DEBUG] images_list[0] exists, proceeding to save image (if enabled) and OCR'
-                            )
-                    if images:
-                        images_list[0].save(
-                            f'debug_images/{Path(pdf_path).stem}_page_{i + 1}.png'
-                            )
-                        if DEBUG:
-                            print(
-                                f'    [DEBUG] Saved debug image for page {i + 1}'
-                                )
-                    ocr_text = pytesseract.image_to_string(images_list[0]
-                        ).strip()
-                    if DEBUG:
-                        print(f'    [DEBUG] OCR completed for page {i + 1}')
-                    used_ocr = True
-                else:
-                    if DEBUG:
-                        print(
-                            f'    [DEBUG] images_list is empty for page {i + 1}'
-                            )
-                    ocr_text = ''
-            except Exception as e:
-                if DEBUG:
-                    print(
-                        f'    [WARN] OCR failed for {pdf_path}, page {i + 1}: {e}'
-                        )
-                ocr_text = ''
-        elif normal_text:
-            page_info['text'] = normal_text
-            page_info['ocr_used'] = False
+        except Exception as e:
+            if DEBUG:
+                print(f'[DEBUG] Image detection failed for page {i + 1}: {e}')
+            has_images = False
+        # Pages that already carry enough native text (e.g. text plus a logo)
+        # are not rasterized and OCR'd just because they contain an image
+        needs_image_ocr = has_images and len(normal_text) < MIN_NATIVE_CHARS
+        if needs_image_ocr or not normal_text:
+            if DEBUG:
+                print(
+                    f'    [DEBUG] Page {i + 1} of {pdf_path} queued for OCR (image: {has_images})'
+                    )
+            ocr_pages.append(i)
+        elif DEBUG:
+            print(f'    [DEBUG] Using native text for page {i + 1}')
+        pages.append({'page': i + 1, 'ocr_used': False, 'text': normal_text})
+    if pdfium_pdf is not None:
+        pdfium_pdf.close()
+    # One Poppler call per run of consecutive OCR pages instead of one per page
+    for first, last in contiguous_page_runs(ocr_pages, OCR_BATCH_PAGES):
+        try:
             if DEBUG:
                 print(
-                    f'    [DEBUG] No image detected, using native text for page {i + 1}'
+                    f'    [DEBUG] Calling convert_from_path for pages {first + 1}-{last + 1}'
                     )
-        else:
+            images_list = convert_from_path(pdf_path, dpi=OCR_DPI,
+                first_page=first + 1, last_page=last + 1, grayscale=True)
+        except Exception as e:
             if DEBUG:
                 print(
-                    f'    [DEBUG] No image and no text, using OCR fallback for {pdf_path}, page {i + 1}'
+                    f'    [WARN] Rasterizing failed for {pdf_path}, pages {first + 1}-{last + 1}: {e}'
                     )
+            images_list = []
+        for i, image in zip(range(first, last + 1), images_list):
+            page_info = pages[i]
             try:
-                if DEBUG:
-                    print(
-                        f'    [DEBUG] Calling convert_from_path for page {i + 1} (OCR fallback)'
-                        )
-                images_list = convert_from_path(pdf_path, first_page=i + 1,
-                    last_page=i + 1)
-                if DEBUG:
-                    print(
-                        f'    [DEBUG] images_list created, length: {len(images_list)}'
-                        )
-                if images_list:
-                    if DEBUG:
-                        print(
-                            f'    [DEBUG] images_list[0] exists, proceeding to save image (if enabled) and OCR (fallback)'
-                            )
-                    if images:
-                        images_list[0].save(
-                            f'debug_images/{Path(pdf_path).stem}_page_{i + 1}.png'
-                            )
-                        if DEBUG:
-                            print(
-                                f'    [DEBUG] Saved debug image for page {i + 1} (fallback)'
-                                )
-                    ocr_text = pytesseract.image_to_string(images_list[0]
-                        ).strip()
-                    if DEBUG:
-                        print(
-                            f'    [DEBUG] OCR completed for page {i + 1} (fallback)'
-                            )
-                    used_ocr = True
-                else:
+                if images:
+                    image.save(
+                        f'debug_images/{Path(pdf_path).stem}_page_{i + 1}.png')
                     if DEBUG:
-                        print(
-                            f'    [DEBUG] images_list is empty for page {i + 1} (fallback)'
-                            )
-                    ocr_text = ''
+                        print(f'    [DEBUG] Saved debug image for page {i + 1}')
+                ocr_text = ocr_image(image)
+                if DEBUG:
+                    print(f'    [DEBUG] OCR completed for page {i + 1}')
+                page_info['ocr_used'] = True
             except Exception as e:
                 if DEBUG:
                     print(
-                        f'    [WARN] OCR fallback failed for {pdf_path}, page {i + 1}: {e}'
+                        f'    [WARN] OCR failed for {pdf_path}, page {i + 1}: {e}'
                         )
                 ocr_text = ''
-        if has_images or not has_images and not normal_text:
-            page_info['text'] = ocr_text
-            page_info['ocr_used'] = used_ocr
+            # Short native text is kept when OCR finds nothing
+            page_info['text'] = ocr_text or page_info['text']
+    for page_info in pages:
         if not page_info['text']:
             page_info['text'] = '[EMPTY PAGE]'
-        if DEBUG:
-            print(f'[DEBUG] Appending page_info for page {i + 1}')
-        pages.append(page_info)
-    if plumber_pdf:
-        plumber_pdf.close()
     return pages
 
 
+def extract_text_from_pdf_cached(pdf_path):
+    """
+    Return the extraction result for a PDF from the content-hash cache, or
+    extract it with extract_text_from_pdf and store it in the cache.
+    Args:
+        pdf_path (str): Path of the PDF.
+    Returns:
+        list: Page dictionaries as returned by extract_text_from_pdf.
+    """
+    # The file is read once; the same bytes are hashed and parsed
+    with open(pdf_path, 'rb') as f:
+        pdf_bytes = f.read()
+    cache_key = (
+        f'{hashlib.sha256(pdf_bytes).hexdigest()}-v{EXTRACTION_CACHE_VERSION}'
+        f'-min{MIN_NATIVE_CHARS}-dpi{OCR_DPI}'
+        )
+    cache_path = os.path.join(CACHE_FOLDER, f'{cache_key}.json')
+    if os.path.exists(cache_path):
+        try:
+            with open(cache_path, 'rb') as f:
+                return orjson.loads(f.read())
+        except (OSError, ValueError):
+            pass
+    pages_data = extract_text_from_pdf(pdf_path, pdf_bytes)
+    if pages_data:
+        # Write to a temporary file first so a concurrent reader never sees a
+        # partially written cache entry
+        tmp_path = f'{cache_path}.{os.getpid()}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(orjson.dumps(pages_data))
+        os.replace(tmp_path, cache_path)
+    return pages_data
+
+
+def init_extract_worker():
+    """
+    Initializer for extraction worker processes: limit Tesseract to a single
+    thread so parallel workers do not oversubscribe the CPU.
+    """
+    os.environ['OMP_THREAD_LIMIT'] = '1'
+
+
 def main():
     """
-    Main driver function: loops through all CAO PDF folders, extracts text from each PDF,
-    and saves the results as JSON. Updates progress and logs debug info.
+    Main driver function: loops through all CAO PDF folders, extracts text from each PDF
+    in a pool of worker processes, and saves the results as JSON. Updates progress and
+    logs debug info.
     """
-    cao_folders = [f for f in Path(INPUT_FOLDER).iterdir() if f.is_dir() and
-        f.name.isdigit()]
+    cao_folders = sorted((entry for entry in os.scandir(INPUT_FOLDER) if
+        entry.is_dir() and entry.name.isdigit()), key=lambda entry: int(
+        entry.name))
     os.makedirs(OUTPUT_FOLDER, exist_ok=True)
-    os.makedirs('debug_images', exist_ok=True)
+    os.makedirs(CACHE_FOLDER, exist_ok=True)
+    if images:
+        os.makedirs('debug_images', exist_ok=True)
     if DEBUG:
         with open(DEBUG_LOG_FILE, 'w', encoding='utf-8') as log_file:
             log_file.write('PDF Extraction Debug Log\n\n')
+    # Collect the work for all CAOs first so PDFs of different CAOs can be
+    # extracted in parallel
+    pending = []
+    cao_results = {}
     for cao_folder in cao_folders:
         cao_number = cao_folder.name
         print(f'Processing CAO {cao_number}')
-        output_cao_folder = Path(OUTPUT_FOLDER) / cao_number
-        output_cao_folder.mkdir(exist_ok=True)
-        if DEBUG:
-            with open(DEBUG_LOG_FILE, 'a', encoding='utf-8') as log_file:
-                log_file.write(f'===== CAO {cao_number} =====\n')
-        pdf_files = list(cao_folder.glob('*.pdf'))
-        successful_extractions = 0
-        failed_files = []
+        output_cao_folder = os.path.join(OUTPUT_FOLDER, cao_number)
+        os.makedirs(output_cao_folder, exist_ok=True)
+        # One directory listing per folder; existing outputs are looked up in
+        # a set instead of stat'ing every expected JSON path
+        pdf_files = sorted((entry for entry in os.scandir(cao_folder.path) if
+            entry.name.endswith('.pdf') and entry.is_file()), key=lambda
+            entry: entry.name)
+        existing_outputs = {entry.name for entry in os.scandir(
+            output_cao_folder)}
+        cao_results[cao_number] = {'successful': 0, 'failed': [],
+            'remaining': 0}
         for pdf_file in pdf_files:
-            json_out_path = output_cao_folder / Path(pdf_file.name
-                ).with_suffix('.json').name
-            if json_out_path.exists():
+            json_name = os.path.splitext(pdf_file.name)[0] + '.json'
+            if json_name in existing_outputs:
                 print(f'  Skipping {pdf_file.name} (extraction already exists)'
                     )
                 continue
+            json_out_path = os.path.join(output_cao_folder, json_name)
+            pending.append((cao_number, pdf_file, json_out_path))
+            cao_results[cao_number]['remaining'] += 1
+    for cao_number, result in cao_results.items():
+        if result['remaining'] == 0:
+            update_progress(cao_number, 'pdf_parsing', successful=0,
+                failed_files=[])
+    if not pending:
+        return
+    with ProcessPoolExecutor(max_workers=EXTRACT_WORKERS, initializer=
+        init_extract_worker) as executor:
+        futures = {}
+        for cao_number, pdf_file, json_out_path in pending:
             print(f'  Processing {pdf_file.name}')
-            print(f'[DEBUG] About to extract: {pdf_file}')
-            if DEBUG:
-                with open(DEBUG_LOG_FILE, 'a', encoding='utf-8') as log_file:
-                    log_file.write(f'  ----- {pdf_file.name} -----\n')
+            print(f'[DEBUG] About to extract: {pdf_file.path}')
+            future = executor.submit(extract_text_from_pdf_cached, pdf_file
+                .path)
+            futures[future] = cao_number, pdf_file, json_out_path
+        # Results are written by this process only, so the JSON files, the debug
+        # log and the progress tracker never see concurrent writers
+        for future in as_completed(futures):
+            cao_number, pdf_file, json_out_path = futures[future]
+            result = cao_results[cao_number]
             try:
-                pages_data = extract_text_from_pdf(str(pdf_file))
+                pages_data = future.result()
                 if DEBUG:
                     with open(DEBUG_LOG_FILE, 'a', encoding='utf-8'
                         ) as log_file:
+                        log_file.write(
+                            f'===== CAO {cao_number} =====\n  ----- {pdf_file.name} -----\n'
+                            )
                         for page in pages_data:
                             if page['ocr_used']:
                                 log_file.write(
@@ -249,16 +382,20 @@ def main():
                                     f"    Page {page['page']}: Native text only\n"
                                     )
                         log_file.write('\n')
-                with open(json_out_path, 'w', encoding='utf-8') as f:
-                    json.dump(pages_data, f, indent=2, ensure_ascii=False)
+                # Compact UTF-8 output: these files are read by the LLM step,
+                # not by people, so indentation only costs time and disk
+                with open(json_out_path, 'wb') as f:
+                    f.write(orjson.dumps(pages_data))
                 print(f'  Saved to {json_out_path}')
-                successful_extractions += 1
+                result['successful'] += 1
             except Exception as e:
                 print(f'  ❌ Failed to extract {pdf_file.name}: {e}')
                 traceback.print_exc()
-                failed_files.append(pdf_file.name)
-        update_progress(cao_number, 'pdf_parsing', successful=
-            successful_extractions, failed_files=failed_files)
+                result['failed'].append(pdf_file.name)
+            result['remaining'] -= 1
+            if result['remaining'] == 0:
+                update_progress(cao_number, 'pdf_parsing', successful=
+                    result['successful'], failed_files=result['failed'])
 
 
 if __name__ == '__main__':
@@ -60,6 +60,9 @@ import sys
 import json
 import time
 import argparse
+import atexit
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Optional, Tuple, Dict, Any
 from dataclasses import dataclass, field
@@ -69,7 +72,6 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 # Third-party imports for environment variables, file locking, and data validation
 from dotenv import load_dotenv
-import fcntl
 from pydantic import BaseModel, Field, ConfigDict
 import yaml
 from monitoring.monitoring_3_1 import PerformanceMonitor
@@ -116,12 +118,25 @@ class CAOExtractionSchema(BaseModel):
         'training_information', 'homeoffice_information']})
 
 
+# JSON schema generated once at import; pydantic would otherwise walk the
+# model tree again for every generate_content call
+CAO_SCHEMA_JSON = CAOExtractionSchema.model_json_schema()
+
+
 # =============================================================================
 # GLOBAL STATE
 # =============================================================================
 # Process-specific quota flags to stop individual processes when daily quota is hit
 process_quota_flags = {}
 
+# Append handles for the failure/timeout logs, opened on first use and kept
+# open (line-buffered) for the lifetime of the process
+_log_files = {}
+_log_files_lock = threading.Lock()
+
+# Output file names per CAO output folder, listed once with os.scandir
+_done_outputs = {}
+
 # =============================================================================
 # CONFIGURATION CLASSES
 # =============================================================================
@@ -146,6 +161,7 @@ class ExtractionConfig:
     thinking_budget: int = -1
     max_retries: int = 5
     delay_between_files: int = 200  # about 5 minutes between files to avoid rate limits
+    concurrent_files: int = 1  # files in flight per process (one API key)
 
 
 @dataclass
@@ -156,20 +172,38 @@ class ExtractionStats:
     failed_files: List[str] = field(default_factory=list)
     timed_out_files: List[str] = field(default_factory=list)
     start_time: float = field(default_factory=time.time)
+    in_flight: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+    
+    def reserve_slot(self, max_files: int) -> bool:
+        """Reserve one of max_files extraction slots; False once successes plus in-flight files reach it."""
+        with self._lock:
+            if self.successful_extractions + self.in_flight >= max_files:
+                return False
+            self.in_flight += 1
+            return True
+    
+    def release_slot(self):
+        """Release a slot taken by reserve_slot once its file is finished."""
+        with self._lock:
+            self.in_flight -= 1
     
     def add_success(self, filename: str):
         """Add a successful extraction."""
-        self.processed_files += 1
-        self.successful_extractions += 1
+        with self._lock:
+            self.processed_files += 1
+            self.successful_extractions += 1
     
     def add_failure(self, filename: str):
         """Add a failed extraction."""
-        self.processed_files += 1
-        self.failed_files.append(filename)
+        with self._lock:
+            self.processed_files += 1
+            self.failed_files.append(filename)
     
     def add_timeout(self, filename: str):
         """Add a timed out extraction."""
-        self.timed_out_files.append(filename)
+        with self._lock:
+            self.timed_out_files.append(filename)
     
     def get_summary(self) -> Dict[str, Any]:
         """Get summary statistics."""
@@ -342,28 +376,43 @@ def validate_markdown_file(markdown_path: str) -> Tuple[bool, str]:
 # =============================================================================
 # Functions for file locking, cleanup, and result saving
 def acquire_file_lock(file_path: Path, context: ProcessingContext) -> bool:
-    """Try to acquire a lock for processing a file."""
+    """Try to acquire a lock for processing a file.
+
+    The lock file is created with O_CREAT | O_EXCL, so exactly one of the
+    processes started by p5_run.py can claim a given output file.
+    """
     lock_file = file_path.with_suffix('.lock')
     try:
-        with open(lock_file, 'w') as f:
-            fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
-            f.write(f'Process {context.process_id + 1} using API key {context.key_number}\n')
-            f.write(f'Timestamp: {time.time()}\n')
-        return True
-    except (IOError, OSError):
+        fd = os.open(lock_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        return False
+    except OSError:
         return False
+    with os.fdopen(fd, 'w') as f:
+        f.write(f'Process {context.process_id + 1} using API key {context.key_number}\n')
+        f.write(f'Timestamp: {time.time()}\n')
+    return True
 
 
 def release_file_lock(file_path: Path):
     """Release the lock for a file."""
-    lock_file = file_path.with_suffix('.lock')
     try:
-        if lock_file.exists():
-            lock_file.unlink()
-    except:
+        os.unlink(file_path.with_suffix('.lock'))
+    except OSError:
         pass
 
 
+def get_done_outputs(output_folder: Path) -> set:
+    """Return the set of file names already in a CAO output folder."""
+    key = str(output_folder)
+    done = _done_outputs.get(key)
+    if done is None:
+        with os.scandir(output_folder) as entries:
+            done = {entry.name for entry in entries}
+        _done_outputs[key] = done
+    return done
+
+
 def announce_cao_once(cao_number: str, context: ProcessingContext) -> bool:
     """Announce a CAO number only once across all processes."""
     announce_file = context.config.output_folder / f'.cao_{cao_number}_announced'
@@ -453,9 +502,9 @@ def get_model_parameters(config) -> Dict[str, Any]:
     }
 
 
-def create_extraction_prompt(filename: str) -> str:
-    """Create the extraction prompt for CAO document processing."""
-    return f"""
+# Extraction instructions shared by every request; built once and sent as the
+# system instruction so each call carries an identical prompt prefix
+EXTRACTION_SYSTEM_INSTRUCTION = """
     Extract information from this Dutch CAO (Collective Labor Agreement) Markdown document, which is a parsed version of the original PDF.
     TASK: Categorize and extract relevant information into the specified fields based on the document content.
     CRITICAL RULES:
@@ -481,8 +530,12 @@ def create_extraction_prompt(filename: str) -> str:
         - Output ONLY valid JSON format.
         - Use ONLY standard ASCII characters (no special/control characters).
         - Replace any special characters with standard equivalents.
-    Document: {filename}
-    """
+""".strip()
+
+
+def create_extraction_prompt(filename: str) -> str:
+    """Create the per-document part of the extraction prompt."""
+    return f'Document: {filename}'
 
 
 def validate_uploaded_file(client, uploaded_file, filename: str, original_size_mb: float):
@@ -572,8 +625,9 @@ def extract_text_safely(response, filename: str):
         print(f'  DEBUG: Found structured output in response.parsed')
         print(f'  DEBUG: response.parsed type: {type(response.parsed)}')
         print(f'  DEBUG: response.parsed content: [STRUCTURED DATA - SUPPRESSED FOR CLARITY]')
-        # Convert structured output to JSON string
-        content = response.parsed.model_dump_json()
+        # Convert structured output to JSON string; with a dict response_schema
+        # the SDK returns plain JSON data rather than a pydantic model
+        content = json.dumps(response.parsed, ensure_ascii=False)
         print(f'  DEBUG: Converted structured output to JSON: {len(content)} chars')
         return content, {"finish": fr or "STOP", "filename": filename}
     
@@ -711,17 +765,26 @@ def handle_llm_errors(error: Exception, attempt: int, max_retries: int, file_siz
 # LOGGING & MONITORING FUNCTIONS
 # =============================================================================
 # Functions for logging processing results and monitoring progress
+def append_log_line(log_path: str, line: str):
+    """Append one line to a log file through a persistent handle."""
+    with _log_files_lock:
+        log_file = _log_files.get(log_path)
+        if log_file is None:
+            log_file = open(log_path, 'a', encoding='utf-8', buffering=1)
+            atexit.register(log_file.close)
+            _log_files[log_path] = log_file
+        log_file.write(line + '\n')
+
+
 def log_processing_result(filename: str, success: bool, context: ProcessingContext, 
                          error_message: str = None):
     """Log processing results to appropriate files."""
     if not success:
         context.stats.add_failure(filename)
-        failed_log_path = 'outputs/logs/failed_files_llm_extraction.txt'
-        with open(failed_log_path, 'a', encoding='utf-8') as f:
-            f.write(f"{time.strftime('%Y-%m-%d %H:%M:%S')} - API {context.key_number}: {filename}")
-            if error_message:
-                f.write(f" (Error: {error_message})")
-            f.write('\n')
+        line = f"{time.strftime('%Y-%m-%d %H:%M:%S')} - API {context.key_number}: {filename}"
+        if error_message:
+            line += f" (Error: {error_message})"
+        append_log_line('outputs/logs/failed_files_llm_extraction.txt', line)
     else:
         context.stats.add_success(filename)
 
@@ -869,7 +932,8 @@ def extract_with_markdown_upload(markdown_path: str, filename: str, cao_number:
                     'presence_penalty': context.config.presence_penalty,
                     'frequency_penalty': context.config.frequency_penalty,
                     'response_mime_type': 'application/json',
-                    'response_schema': CAOExtractionSchema,
+                    'response_schema': CAO_SCHEMA_JSON,
+                    'system_instruction': EXTRACTION_SYSTEM_INSTRUCTION,
                     'thinking_config': types.ThinkingConfig(thinking_budget=context.config.thinking_budget),
                     'http_options': types.HttpOptions(timeout=timeout_seconds * 1000),
                     'safety_settings': safety_settings
@@ -980,25 +1044,33 @@ def process_single_file(markdown_file: Path, cao_number: str, output_folder: Pat
         output_filename += '.json'
     
     output_file = output_folder / output_filename
+    done_outputs = get_done_outputs(output_folder)
     
     # Check if already processed
-    if output_file.exists():
+    if output_filename in done_outputs:
         print(f'  {cao_number}: Skipping {markdown_file.name} (already processed)')
-        time.sleep(5)
         # Don't count already processed files toward the limit
         return True
     
-    # Check file limit (only count successful extractions)
-    if context.stats.successful_extractions >= context.config.max_files:
+    # Check file limit (only count successful extractions); the slot is
+    # reserved under the stats lock so concurrent workers cannot overshoot
+    if not context.stats.reserve_slot(context.config.max_files):
         return False
     
     # Try to acquire lock
     if not acquire_file_lock(output_file, context):
+        context.stats.release_slot()
         print(f'  {cao_number}: Skipping {markdown_file.name} (being processed by another process)')
         time.sleep(2)
         return True
     
     try:
+        # Another process may have finished this file since the folder was listed
+        if output_file.exists():
+            done_outputs.add(output_filename)
+            print(f'  {cao_number}: Skipping {markdown_file.name} (already processed)')
+            return True
+        
         # Validate markdown file
         is_valid, quality_message = validate_markdown_file(str(markdown_file))
         if not is_valid:
@@ -1021,9 +1093,8 @@ def process_single_file(markdown_file: Path, cao_number: str, output_folder: Pat
         if time.time() - extraction_start > max_processing_time:
             print(f'  {cao_number}: ⏰ Timeout after {context.config.max_processing_hours} hours for {markdown_file.name} [API {context.key_number}/{context.total_processes}]')
             context.stats.add_timeout(markdown_file.name)
-            timeout_log_path = 'outputs/logs/timed_out_files_llm_extraction.txt'
-            with open(timeout_log_path, 'a', encoding='utf-8') as f:
-                f.write(f"{time.strftime('%Y-%m-%d %H:%M:%S')} - API {context.key_number}: {markdown_file.name}\n")
+            append_log_line('outputs/logs/timed_out_files_llm_extraction.txt',
+                            f"{time.strftime('%Y-%m-%d %H:%M:%S')} - API {context.key_number}: {markdown_file.name}")
             return True
         
         # Extract content
@@ -1043,6 +1114,7 @@ def process_single_file(markdown_file: Path, cao_number: str, output_folder: Pat
         
         # Save result
         save_extraction_result(output_file, raw_output)
+        done_outputs.add(output_filename)
         print(f'  {cao_number}: LLM extraction completed in {extraction_time:.2f} seconds [API {context.key_number}/{context.total_processes}]')
         
         # Mark as successful after saving
@@ -1065,6 +1137,7 @@ def process_single_file(markdown_file: Path, cao_number: str, output_folder: Pat
         return True
     finally:
         release_file_lock(output_file)
+        context.stats.release_slot()
 
 
 # =============================================================================
@@ -1082,12 +1155,16 @@ def cleanup_announce_files(context: ProcessingContext):
         if announce_files:
             print(f'  🧹 Cleaned up {len(announce_files)} announce files')
         
-        # Clean up lock files in all CAO folders
+        # Clean up stale lock files left behind by crashed processes; locks
+        # younger than the processing timeout may still be held by a sibling
         lock_files_found = 0
+        stale_before = time.time() - context.config.max_processing_hours * 3600
         for cao_folder in context.config.output_folder.iterdir():
             if cao_folder.is_dir() and cao_folder.name.isdigit():
-                lock_files = list(cao_folder.glob('.cao_*_processing'))
+                lock_files = list(cao_folder.glob('*.lock'))
                 for lock_file in lock_files:
+                    if lock_file.stat().st_mtime > stale_before:
+                        continue
                     lock_file.unlink()
                     print(f'  🧹 Cleaned up lock file: {cao_folder.name}/{lock_file.name}')
                     lock_files_found += 1
@@ -1137,6 +1214,7 @@ def run_extraction_pipeline():
     parser.add_argument('--process_id', type=int, default=0, help='Process ID for parallel processing')
     parser.add_argument('--total_processes', type=int, default=1, help='Total number of parallel processes')
     parser.add_argument('--max_files', type=int, help='Maximum number of files to process')
+    parser.add_argument('--concurrent_files', type=int, help='Number of files sent to Gemini concurrently')
     
     args = parser.parse_args()
     
@@ -1150,6 +1228,8 @@ def run_extraction_pipeline():
     # Override max_files if provided as argument
     if args.max_files is not None:
         config.max_files = args.max_files
+    if args.concurrent_files is not None:
+        config.concurrent_files = max(1, args.concurrent_files)
     
     # Validate paths
     validate_input_paths(config)
@@ -1170,10 +1250,16 @@ def run_extraction_pipeline():
     print(f"📁 Input: {config.input_folder}")
     print(f"📁 Output: {config.output_folder}")
     print(f"📄 Files to process: {len(filtered_files)}")
+    print(f"🔀 Concurrent files: {config.concurrent_files}")
     print()
     
-    # Process files
-    for cao_folder, markdown_file in filtered_files:
+    # Process files; with concurrent_files > 1 several Gemini requests are in
+    # flight on the same API key, each worker blocking on network I/O
+    stop_processing = threading.Event()
+    
+    def process_file(cao_folder: Path, markdown_file: Path):
+        if stop_processing.is_set():
+            return
         cao_number = cao_folder.name
         output_folder = config.output_folder / cao_number
         output_folder.mkdir(exist_ok=True)
@@ -1184,7 +1270,19 @@ def run_extraction_pipeline():
         # Process file
         should_continue = process_single_file(markdown_file, cao_number, output_folder, context, len(filtered_files))
         if not should_continue:
-            break
+            stop_processing.set()
+    
+    with ThreadPoolExecutor(max_workers=config.concurrent_files) as executor:
+        futures = [executor.submit(process_file, cao_folder, markdown_file)
+                   for cao_folder, markdown_file in filtered_files]
+        # Surface errors raised outside process_single_file's own handling;
+        # queued files see stop_processing and return without work
+        try:
+            for future in futures:
+                future.result()
+        except BaseException:
+            stop_processing.set()
+            raise
     
     # Display final results
     display_final_results(context)
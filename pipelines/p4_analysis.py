@@ -1,6 +1,7 @@
 import os
 import sys
 import json
+import orjson
 import pandas as pd
 import time
 from pathlib import Path
@@ -14,6 +15,12 @@ from dotenv import load_dotenv
 from utils.OUTPUT_tracker import update_progress
 import re
 import fcntl
+import threading
+import hashlib
+import random
+from collections import deque
+from functools import lru_cache, partial
+from concurrent.futures import ThreadPoolExecutor
 
 
 def acquire_file_lock(file_path):
@@ -64,12 +71,11 @@ DEBUG_MODE = False
 MAX_JSON_FILES = 1000
 MAX_PROCESSING_TIME_HOURS = 1
 SORTED_FILES = False
+# Every process shuffles with the same seed, so all agree on the order
+SHUFFLE_SEED = 43
 key_number = int(sys.argv[1]) if len(sys.argv) > 1 else 1
 process_id = int(sys.argv[2]) if len(sys.argv) > 2 else 0
 total_processes = int(sys.argv[3]) if len(sys.argv) > 3 else 1
-if not SORTED_FILES:
-    import random
-    random.seed(43)
 load_dotenv()
 api_key = os.getenv(f'GOOGLE_API_KEY{key_number}')
 if not api_key:
@@ -93,6 +99,21 @@ LLM_TOP_P = 0.1
 LLM_TOP_K = 1
 LLM_MAX_TOKENS = None
 LLM_CANDIDATE_COUNT = 1
+# All analysis prompts expect a JSON answer, so Gemini's JSON mode is enabled
+LLM_RESPONSE_MIME_TYPE = 'application/json'
+GENERATION_CONFIG = genai.types.GenerationConfig(temperature=LLM_TEMPERATURE,
+    top_p=LLM_TOP_P, top_k=LLM_TOP_K, max_output_tokens=LLM_MAX_TOKENS,
+    candidate_count=LLM_CANDIDATE_COUNT, response_mime_type=
+    LLM_RESPONSE_MIME_TYPE)
+_generative_models = {}
+# Bump PROMPT_VERSION whenever a prompt template or the generation settings
+# change, so that cached responses of the old prompt are no longer used
+PROMPT_VERSION = 'v4'
+RESPONSE_CACHE_FOLDER = Path(config['paths']['outputs_analysis']) / 'llm_cache'
+RESPONSE_CACHE_TTL_DAYS = 7
+# Malformed (unparseable or off-schema) answers are retried after a short
+# pause instead of the long quota/timeout backoff
+MALFORMED_RETRY_SECONDS = 10
 INFOTYPE_FIELD_MAPPINGS = {'Pension': ['pension_premium_basic',
     'pension_premium_plus', 'retire_age_basic', 'retire_age_plus',
     'pension_age_group'], 'Leave': ['maternity_leave', 'maternity_pay',
@@ -197,28 +218,195 @@ cao_info_mapping = load_cao_info()
 df_results = pd.DataFrame(columns=columns)
 
 
-def query_gemini(prompt, model=GEMINI_MODEL, max_retries=5):
+# Pacing of Gemini requests: at most REQUESTS_PER_MINUTE and about
+# TOKENS_PER_MINUTE input tokens per process, and after a failed request (429,
+# 504 or other error) every request waits until the shared retry cooldown has
+# passed instead of each caller sleeping alone.
+# The salary and rest extractions of a file run on LLM_WORKERS threads, so
+# the pacing state is shared between them under _pacing_lock
+REQUESTS_PER_MINUTE = 5
+TOKENS_PER_MINUTE = 125000
+LLM_WORKERS = 2
+_last_request_time = 0.0
+_retry_cooldown_until = 0.0
+_sent_tokens = deque()
+_pacing_lock = threading.Lock()
+
+
+def estimate_tokens(text):
+    """
+    Estimate the number of input tokens of a prompt (about 4 characters per token).
+    Args:
+        text (str): The prompt text.
+    Returns:
+        int: Estimated token count.
+    """
+    return len(text) // 4
+
+
+def wait_for_request_slot(estimated_tokens=0):
+    """
+    Sleep until this process may send its next Gemini request: at least
+    60 / REQUESTS_PER_MINUTE seconds after the previous request, not before
+    the retry cooldown has expired, and once the requests of the last minute
+    leave room for estimated_tokens within TOKENS_PER_MINUTE. Returns
+    immediately when there is headroom.
+    Args:
+        estimated_tokens (int): Estimated input tokens of the request.
+    """
+    global _last_request_time
+    with _pacing_lock:
+        ready_at = max(_last_request_time + 60 / REQUESTS_PER_MINUTE,
+            _retry_cooldown_until, time.time())
+        while _sent_tokens and _sent_tokens[0][0] <= ready_at - 60:
+            _sent_tokens.popleft()
+        used_tokens = sum(tokens for _, tokens in _sent_tokens)
+        for sent_at, tokens in _sent_tokens:
+            if used_tokens + estimated_tokens <= TOKENS_PER_MINUTE:
+                break
+            ready_at = max(ready_at, sent_at + 60)
+            used_tokens -= tokens
+        _last_request_time = ready_at
+        _sent_tokens.append((ready_at, estimated_tokens))
+    delay = ready_at - time.time()
+    if delay > 0:
+        time.sleep(delay)
+
+
+def start_retry_cooldown(seconds):
+    """
+    Hold back all further Gemini requests of this process for about the given
+    time. The length is jittered by +/-25% so that sibling processes sharing
+    an API key do not all retry at the same moment.
+    Args:
+        seconds (float): Nominal length of the cooldown.
+    """
+    global _retry_cooldown_until
+    retry_at = time.time() + seconds * random.uniform(0.75, 1.25)
+    with _pacing_lock:
+        _retry_cooldown_until = max(_retry_cooldown_until, retry_at)
+
+
+def get_response_cache_path(prompt, model, system_instruction=None):
+    """
+    Return the cache file for a prompt, addressed by the SHA-256 of the prompt version, model, system instruction and prompt.
+    Args:
+        prompt (str): The prompt sent to Gemini.
+        model (str): The Gemini model name.
+        system_instruction (str): Static instructions sent ahead of the prompt.
+    Returns:
+        Path: Location of the cached response.
+    """
+    digest = hashlib.sha256((PROMPT_VERSION + model).encode('utf-8'))
+    if system_instruction:
+        digest.update(system_instruction.encode('utf-8'))
+    digest.update(prompt.encode('utf-8'))
+    return RESPONSE_CACHE_FOLDER / f'{digest.hexdigest()}.txt'
+
+
+def load_cached_response(cache_path):
+    """
+    Load a cached Gemini response if it exists and is younger than RESPONSE_CACHE_TTL_DAYS.
+    Args:
+        cache_path (Path): Location of the cached response.
+    Returns:
+        str or None: The cached response, or None on a miss.
+    """
+    try:
+        age_seconds = time.time() - cache_path.stat().st_mtime
+        if age_seconds > RESPONSE_CACHE_TTL_DAYS * 86400:
+            return None
+        return cache_path.read_text(encoding='utf-8')
+    except OSError:
+        return None
+
+
+def save_cached_response(cache_path, response_text):
+    """
+    Write a Gemini response to the cache atomically (temporary file + rename).
+    Args:
+        cache_path (Path): Location of the cached response.
+        response_text (str): The raw Gemini output.
+    """
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_name(
+            f'{cache_path.name}.{os.getpid()}.tmp')
+        tmp_path.write_text(response_text, encoding='utf-8')
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        if DEBUG_MODE:
+            print(f'  Could not write response cache: {e}')
+
+
+def get_generative_model(model, system_instruction=None):
+    """
+    Return the GenerativeModel for a model name and system instruction, creating it on first use so its client is reused across calls.
+    Args:
+        model (str): The Gemini model name.
+        system_instruction (str): Static instructions sent with every request.
+    Returns:
+        genai.GenerativeModel: The shared model instance.
+    """
+    model_key = model, system_instruction
+    if model_key not in _generative_models:
+        _generative_models[model_key] = genai.GenerativeModel(model,
+            system_instruction=system_instruction)
+    return _generative_models[model_key]
+
+
+class MalformedOutputError(ValueError):
+    """Raised when a Gemini answer cannot be parsed or does not match the requested fields."""
+
+
+def query_gemini(prompt, model=GEMINI_MODEL, max_retries=5,
+    system_instruction=None, validate_output=None):
     """
     Query Gemini model with improved exponential backoff retry logic for 504 errors.
+    Responses are served from the on-disk cache when the same prompt was answered before.
     Args:
         prompt (str): The prompt to send to Gemini.
         model (str): The Gemini model name.
         max_retries (int): Maximum number of retry attempts.
+        system_instruction (str): Static instructions sent ahead of the prompt.
+        validate_output (callable): Optional check of the raw output that raises MalformedOutputError; malformed answers are retried after MALFORMED_RETRY_SECONDS and never cached.
     Returns:
         str: The raw Gemini output.
     """
+    cache_path = get_response_cache_path(prompt, model, system_instruction)
+    cached_response = load_cached_response(cache_path)
+    if cached_response:
+        try:
+            if validate_output:
+                validate_output(cached_response)
+            return cached_response
+        except MalformedOutputError:
+            pass
+    estimated_tokens = estimate_tokens(prompt) + estimate_tokens(
+        system_instruction or '')
+    model_obj = get_generative_model(model, system_instruction)
     for attempt in range(max_retries):
+        wait_for_request_slot(estimated_tokens)
         try:
-            model_obj = genai.GenerativeModel(model)
-            generation_config = genai.types.GenerationConfig(temperature=
-                LLM_TEMPERATURE, top_p=LLM_TOP_P, top_k=LLM_TOP_K,
-                max_output_tokens=LLM_MAX_TOKENS, candidate_count=
-                LLM_CANDIDATE_COUNT)
             response = model_obj.generate_content(prompt, generation_config
-                =generation_config)
+                =GENERATION_CONFIG)
             if hasattr(response, 'text') and response.text.strip():
+                if validate_output:
+                    validate_output(response.text)
+                save_cached_response(cache_path, response.text)
                 return response.text
             raise ValueError('Empty or invalid model response')
+        except MalformedOutputError as e:
+            if attempt < max_retries - 1:
+                print(
+                    f'  Attempt {attempt + 1} returned malformed output ({e}), retrying in {MALFORMED_RETRY_SECONDS} seconds... [API {key_number}/{total_processes}]'
+                    )
+                time.sleep(MALFORMED_RETRY_SECONDS)
+                continue
+            print(
+                f'  All {max_retries} attempts returned malformed output - skipping file [API {key_number}/{total_processes}]'
+                )
+            return ''
         except Exception as e:
             error_str = str(e).lower()
             if 'deadlineexceeded' in error_str or '504' in error_str:
@@ -227,7 +415,7 @@ def query_gemini(prompt, model=GEMINI_MODEL, max_retries=5):
                     print(
                         f'  Attempt {attempt + 1} failed (504 timeout), retrying in {wait_time // 60} minutes... [API {key_number}/{total_processes}]'
                         )
-                    time.sleep(wait_time)
+                    start_retry_cooldown(wait_time)
                     continue
                 else:
                     print(
@@ -241,7 +429,7 @@ def query_gemini(prompt, model=GEMINI_MODEL, max_retries=5):
                     print(
                         f'  Attempt {attempt + 1} failed (rate limit), retrying in {wait_time // 60} minutes... [API {key_number}/{total_processes}]'
                         )
-                    time.sleep(wait_time)
+                    start_retry_cooldown(wait_time)
                     continue
                 else:
                     print(
@@ -253,13 +441,17 @@ def query_gemini(prompt, model=GEMINI_MODEL, max_retries=5):
                 print(
                     f'  Attempt {attempt + 1} failed ({type(e).__name__}), retrying in {wait_time // 60} minutes... [API {key_number}/{total_processes}]'
                     )
-                time.sleep(wait_time)
+                start_retry_cooldown(wait_time)
                 continue
             else:
                 raise e
     raise ValueError(f'All {max_retries} retry attempts failed')
 
 
+_CODE_FENCE_LINE_RE = re.compile('^[ \\t]*```.*\\n?', re.MULTILINE)
+_TRAILING_COMMA_RE = re.compile(',\\s*(?=[}\\]])')
+
+
 def clean_gemini_output(output):
     """
     Clean the Gemini model output by removing markdown and trailing commas.
@@ -268,34 +460,72 @@ def clean_gemini_output(output):
     Returns:
         str: Cleaned output string.
     """
-    if output.strip().startswith('```'):
-        lines = output.strip().splitlines()
-        content = '\n'.join(line for line in lines if not line.strip().
-            startswith('```'))
-    else:
-        content = output.strip()
-    import re
-    content = re.sub(',\\s*(?=[}\\]])', '', content)
-    return content
+    content = output.strip()
+    if content.startswith('```'):
+        content = _CODE_FENCE_LINE_RE.sub('', content).strip()
+    return _TRAILING_COMMA_RE.sub('', content)
 
 
-def extract_fields_from_text(text, prompt_fields_markdown, filename=''):
+def parse_gemini_json(cleaned_output):
     """
-    Generate a prompt with the list of desired fields and extract structured data from text.
+    Parse cleaned Gemini output with orjson, falling back to json for input orjson rejects (e.g. NaN).
+    Args:
+        cleaned_output (str): Output returned by clean_gemini_output.
+    Returns:
+        dict or list: The parsed JSON value.
+    """
+    try:
+        return orjson.loads(cleaned_output)
+    except orjson.JSONDecodeError:
+        return json.loads(cleaned_output)
+
+
+@lru_cache(maxsize=None)
+def get_markdown_fields(prompt_fields_markdown):
+    """
+    Get the field names from the header row of a fields markdown table.
     Args:
-        text (str): The full CAO text to extract from.
         prompt_fields_markdown (str): Markdown table of fields.
-        filename (str): The filename for context.
     Returns:
-        dict: Extracted fields as a dictionary.
+        frozenset: Field names, without File_name.
     """
-    prompt = f"""You are an AI assistant that extracts structured JSON data from Dutch collective labor agreements (CAOs). These CAOs were originally provided as PDF files, and are now given to you as structured JSON files derived from them.
+    header = prompt_fields_markdown.splitlines()[0].strip('|').split('|')
+    return frozenset(col.strip() for col in header) - {'File_name'}
 
-=== Source Text ===
-The input is a shortened and grouped JSON-like structure. Each section is titled according to its content (e.g., "Wage information", "Pension information"), and contains a list of paragraphs or table contents from the CAO PDF relevant to that topic.
-From file: {filename}
 
-{text}
+def validate_extraction_output(raw_output, prompt_fields_markdown):
+    """
+    Check that a Gemini answer is a JSON object (or list of objects) using the requested field names. Empty answers are accepted, since a document may hold none of the fields.
+    Args:
+        raw_output (str): The raw output from Gemini.
+        prompt_fields_markdown (str): Markdown table of the requested fields.
+    Raises:
+        MalformedOutputError: If the output is not usable.
+    """
+    try:
+        parsed = parse_gemini_json(clean_gemini_output(raw_output))
+    except ValueError as e:
+        raise MalformedOutputError(f'invalid JSON: {e}') from e
+    items = parsed if isinstance(parsed, list) else [parsed]
+    expected_fields = get_markdown_fields(prompt_fields_markdown)
+    for item in items:
+        if not isinstance(item, dict):
+            raise MalformedOutputError(
+                f'expected an object, got {type(item).__name__}')
+        if item and not expected_fields.intersection(item):
+            raise MalformedOutputError('none of the requested fields present')
+
+
+@lru_cache(maxsize=None)
+def build_fields_instruction(prompt_fields_markdown):
+    """
+    Build the static instructions of the full fields prompt. They are identical for every file, so they are built once and sent as the system instruction; only the source text is formatted per call.
+    Args:
+        prompt_fields_markdown (str): Markdown table of fields.
+    Returns:
+        str: The system instruction.
+    """
+    return f"""You are an AI assistant that extracts structured JSON data from Dutch collective labor agreements (CAOs). These CAOs were originally provided as PDF files, and are now given to you as structured JSON files derived from them.
 
 === Extraction Fields ===
 Below is a table of fields to extract. The first row contains the field names. The rows below describe each field. They have the following format: Description (expected format). Help or further guidance. Ex: one or more examples
@@ -322,10 +552,31 @@ Return ONLY valid JSON, for example:
 Do NOT wrap the JSON in code blocks or markdown. Do NOT include any explanations or comments.
 Reminder: Only output factual information stated in the source text. No assumptions, no guesses. If unsure, leave the field empty.
 """
-    raw_output = query_gemini(prompt)
+
+
+def extract_fields_from_text(text, prompt_fields_markdown, filename=''):
+    """
+    Generate a prompt with the list of desired fields and extract structured data from text.
+    Args:
+        text (str): The full CAO text to extract from.
+        prompt_fields_markdown (str): Markdown table of fields.
+        filename (str): The filename for context.
+    Returns:
+        dict: Extracted fields as a dictionary.
+    """
+    system_instruction = build_fields_instruction(prompt_fields_markdown)
+    prompt = f"""=== Source Text ===
+The input is a shortened and grouped JSON-like structure. Each section is titled according to its content (e.g., "Wage information", "Pension information"), and contains a list of paragraphs or table contents from the CAO PDF relevant to that topic.
+From file: {filename}
+
+{text}
+"""
+    raw_output = query_gemini(prompt, system_instruction=system_instruction,
+        validate_output=partial(validate_extraction_output,
+        prompt_fields_markdown=prompt_fields_markdown))
     cleaned_output = clean_gemini_output(raw_output)
     try:
-        return json.loads(cleaned_output)
+        return parse_gemini_json(cleaned_output)
     except Exception as e:
         if DEBUG_MODE:
             print(
@@ -334,21 +585,16 @@ Reminder: Only output factual information stated in the source text. No assumpti
         return {}
 
 
-def extract_salary_fields_from_text(text, prompt_fields_markdown, filename=''):
+@lru_cache(maxsize=None)
+def build_salary_instruction(prompt_fields_markdown):
     """
-    Extract salary-related fields from CAO text using only wage information.
+    Build the system instruction of the salary prompt (see build_fields_instruction).
     Args:
-        text (str): The wage information section from CAO JSON.
         prompt_fields_markdown (str): Markdown table of salary fields.
-        filename (str): The filename for context.
     Returns:
-        dict: Extracted salary fields as a dictionary.
+        str: The system instruction.
     """
-    prompt = f"""You are an AI assistant that extracts structured JSON data from Dutch collective labor agreements (CAOs). These CAOs were originally provided as PDF files, and are now given to you as structured JSON files derived from them.
-
-=== Source Text ===
-The input is wage information from a CAO document. This section contains salary tables, job classifications, and wage-related rules.
-{text}
+    return f"""You are an AI assistant that extracts structured JSON data from Dutch collective labor agreements (CAOs). These CAOs were originally provided as PDF files, and are now given to you as structured JSON files derived from them.
 
 === Extraction Fields ===
 Below is a table of salary fields to extract. The first row contains the field names. The rows below describe each field. They have the following format: Description (expected format). Help or further guidance. Ex: one or more examples
@@ -373,12 +619,31 @@ Return ONLY valid JSON, for example:
 Do NOT wrap the JSON in code blocks or markdown. Do NOT include any explanations or comments.
 Reminder: Only output factual information stated directly in the source text! No assumptions, no guesses!
 """
-    raw_output = query_gemini(prompt)
+
+
+def extract_salary_fields_from_text(text, prompt_fields_markdown, filename=''):
+    """
+    Extract salary-related fields from CAO text using only wage information.
+    Args:
+        text (str): The wage information section from CAO JSON.
+        prompt_fields_markdown (str): Markdown table of salary fields.
+        filename (str): The filename for context.
+    Returns:
+        dict: Extracted salary fields as a dictionary.
+    """
+    system_instruction = build_salary_instruction(prompt_fields_markdown)
+    prompt = f"""=== Source Text ===
+The input is wage information from a CAO document. This section contains salary tables, job classifications, and wage-related rules.
+{text}
+"""
+    raw_output = query_gemini(prompt, system_instruction=system_instruction,
+        validate_output=partial(validate_extraction_output,
+        prompt_fields_markdown=prompt_fields_markdown))
     if not raw_output:
         return None
     cleaned_output = clean_gemini_output(raw_output)
     try:
-        return json.loads(cleaned_output)
+        return parse_gemini_json(cleaned_output)
     except Exception as e:
         if DEBUG_MODE:
             print(
@@ -387,23 +652,16 @@ Reminder: Only output factual information stated directly in the source text! No
         return {}
 
 
-def extract_rest_fields_from_text(text, prompt_fields_markdown, filename=''):
+@lru_cache(maxsize=None)
+def build_rest_instruction(prompt_fields_markdown):
     """
-    Extract non-salary fields from CAO text using general, pension, leave, termination, overtime, training, and homeoffice information.
+    Build the system instruction of the non-salary prompt (see build_fields_instruction).
     Args:
-        text (str): The non-wage sections from CAO JSON.
         prompt_fields_markdown (str): Markdown table of non-salary fields.
-        filename (str): The filename for context.
     Returns:
-        dict: Extracted non-salary fields as a dictionary.
+        str: The system instruction.
     """
-    prompt = f"""You are an AI assistant that extracts structured JSON data from Dutch collective labor agreements (CAOs). These CAOs were originally provided as PDF files, and are now given to you as structured JSON files derived from them.
-
-=== Source Text ===
-The input contains information from a CAO document, including general contract information, pension details, leave policies, termination procedures, overtime rules, training provisions, and home office policies.
-From file: {filename}
-
-{text}
+    return f"""You are an AI assistant that extracts structured JSON data from Dutch collective labor agreements (CAOs). These CAOs were originally provided as PDF files, and are now given to you as structured JSON files derived from them.
 
 === Extraction Fields ===
 Below is a table of fields to extract. The first row contains the field names. The rows below describe each field. They have the following format: Description (expected format). Help or further guidance. Ex: one or more examples
@@ -428,12 +686,33 @@ Return ONLY valid JSON, for example:
 Do NOT wrap the JSON in code blocks or markdown. Do NOT include any explanations or comments.
 Reminder: Only output factual information stated in the source text! No assumptions, no guesses!
 """
-    raw_output = query_gemini(prompt)
+
+
+def extract_rest_fields_from_text(text, prompt_fields_markdown, filename=''):
+    """
+    Extract non-salary fields from CAO text using general, pension, leave, termination, overtime, training, and homeoffice information.
+    Args:
+        text (str): The non-wage sections from CAO JSON.
+        prompt_fields_markdown (str): Markdown table of non-salary fields.
+        filename (str): The filename for context.
+    Returns:
+        dict: Extracted non-salary fields as a dictionary.
+    """
+    system_instruction = build_rest_instruction(prompt_fields_markdown)
+    prompt = f"""=== Source Text ===
+The input contains information from a CAO document, including general contract information, pension details, leave policies, termination procedures, overtime rules, training provisions, and home office policies.
+From file: {filename}
+
+{text}
+"""
+    raw_output = query_gemini(prompt, system_instruction=system_instruction,
+        validate_output=partial(validate_extraction_output,
+        prompt_fields_markdown=prompt_fields_markdown))
     if not raw_output:
         return None
     cleaned_output = clean_gemini_output(raw_output)
     try:
-        return json.loads(cleaned_output)
+        return parse_gemini_json(cleaned_output)
     except Exception as e:
         if DEBUG_MODE:
             print(
@@ -579,6 +858,29 @@ def normalize_filename(name):
     return name
 
 
+def load_already_analyzed():
+    """
+    Read the final Excel file once and collect the files it already contains.
+    Returns:
+        set: (File_name, CAO) pairs that were analyzed in an earlier run.
+    """
+    final_excel_path = f"{config['paths']['outputs_excel']}/extracted_data.xlsx"
+    if not os.path.exists(final_excel_path):
+        return set()
+    try:
+        existing_df = pd.read_excel(final_excel_path, usecols=lambda col:
+            col in ('File_name', 'CAO'))
+    except Exception as e:
+        if DEBUG_MODE:
+            print(f'  Could not check final Excel file: {e}')
+        return set()
+    if ('File_name' not in existing_df.columns or 'CAO' not in
+        existing_df.columns):
+        return set()
+    return set(zip(existing_df['File_name'], existing_df['CAO'].astype(str)))
+
+
+already_analyzed = load_already_analyzed()
 cao_analysis_tracking = {}
 cao_folders = sorted([f for f in Path(INPUT_JSON_FOLDER).iterdir() if f.
     is_dir() and f.name.isdigit()], key=lambda f: int(f.name))
@@ -589,16 +891,16 @@ for cao_folder in cao_folders:
     for json_file in json_files:
         all_json_files.append((cao_folder, json_file))
 if not SORTED_FILES:
-    import random
-    random.shuffle(all_json_files)
+    random.Random(SHUFFLE_SEED).shuffle(all_json_files)
 current_cao = None
 processed_files = 0
 successful_analyses = 0
 failed_files = []
 timed_out_files = []
-for file_idx, (cao_folder, json_file) in enumerate(all_json_files):
-    if file_idx % total_processes != process_id:
-        continue
+llm_executor = ThreadPoolExecutor(max_workers=LLM_WORKERS)
+extractions_by_content = {}
+# Each process takes every total_processes-th file of the shared order
+for cao_folder, json_file in all_json_files[process_id::total_processes]:
     if processed_files >= MAX_JSON_FILES:
         break
     cao_number = cao_folder.name
@@ -645,33 +947,13 @@ for file_idx, (cao_folder, json_file) in enumerate(all_json_files):
             print(
                 f'[DEBUG] Could not extract CAO number from folder for {json_file.name}'
                 )
-        final_excel_path = (
-            f"{config['paths']['outputs_excel']}/extracted_data.xlsx")
-        already_processed = False
-        if os.path.exists(final_excel_path):
-            try:
-                time.sleep(0.1)
-                existing_df = pd.read_excel(final_excel_path)
-                if ('File_name' in existing_df.columns and 'CAO' in
-                    existing_df.columns):
-                    file_exists = existing_df[(existing_df['File_name'] ==
-                        json_file.name) & (existing_df['CAO'].astype(str) ==
-                        str(cao_number))].shape[0] > 0
-                    if file_exists:
-                        already_processed = True
-                        print(
-                            f'  {cao_number}: Skipping {json_file.name} (already in final Excel file for CAO {cao_number})'
-                            )
-                        release_file_lock(json_file)
-                        continue
-            except Exception as e:
-                if DEBUG_MODE:
-                    print(f'  Could not check final Excel file: {e}')
-        if already_processed:
-            release_file_lock(json_file)
+        if (json_file.name, str(cao_number)) in already_analyzed:
+            print(
+                f'  {cao_number}: Skipping {json_file.name} (already in final Excel file for CAO {cao_number})'
+                )
             continue
-        with open(json_file, 'r', encoding='utf-8') as f:
-            context_by_infotype = json.load(f)
+        with open(json_file, 'rb') as f:
+            context_by_infotype = orjson.loads(f.read())
         print(
             f'  {cao_number}: {json_file.name} [API {key_number}/{total_processes}]'
             )
@@ -713,13 +995,42 @@ for file_idx, (cao_folder, json_file) in enumerate(all_json_files):
         print(
             f'  {cao_number}: Salary LLM extraction (Request size: {salary_request_size:.1f} KB, {salary_request_chars:,} characters) [API {key_number}/{total_processes}]'
             )
-        salary_start = time.time()
-        salary_extracted = extract_salary_fields_from_text(salary_text,
-            prompt_salary_markdown, filename=json_file.name)
-        salary_time = time.time() - salary_start
+        rest_request_size = len(rest_text.encode('utf-8')) / 1024
+        rest_request_chars = len(rest_text)
         print(
-            f'  {cao_number}: Salary LLM extraction completed in {salary_time:.2f} seconds [API {key_number}/{total_processes}]'
+            f'  {cao_number}: Rest LLM extraction (Request size: {rest_request_size:.1f} KB, {rest_request_chars:,} characters) [API {key_number}/{total_processes}]'
             )
+        # Files with identical section texts (e.g. re-exports of the same
+        # PDF) reuse the extraction of the first one
+        content_key = hashlib.blake2b((salary_text + '\0' + rest_text).
+            encode('utf-8'), digest_size=16).hexdigest()
+        if content_key in extractions_by_content:
+            salary_extracted, rest_extracted, source_name = (
+                extractions_by_content[content_key])
+            print(
+                f'  {cao_number}: Reusing LLM extraction of identical content from {source_name} [API {key_number}/{total_processes}]'
+                )
+        else:
+            # Both extractions are independent, so their requests overlap
+            llm_start = time.time()
+            salary_future = llm_executor.submit(
+                extract_salary_fields_from_text, salary_text,
+                prompt_salary_markdown, filename=json_file.name)
+            rest_future = llm_executor.submit(extract_rest_fields_from_text,
+                rest_text, prompt_rest_markdown, filename=json_file.name)
+            salary_extracted = salary_future.result()
+            salary_time = time.time() - llm_start
+            print(
+                f'  {cao_number}: Salary LLM extraction completed in {salary_time:.2f} seconds [API {key_number}/{total_processes}]'
+                )
+            rest_extracted = rest_future.result()
+            rest_time = time.time() - llm_start
+            print(
+                f'  {cao_number}: Rest LLM extraction completed in {rest_time:.2f} seconds [API {key_number}/{total_processes}]'
+                )
+            if salary_extracted is not None and rest_extracted is not None:
+                extractions_by_content[content_key] = (salary_extracted,
+                    rest_extracted, json_file.name)
         if salary_extracted is None:
             print(
                 f'  {cao_number}: ✗ Salary extraction failed for {json_file.name} [API {key_number}/{total_processes}]'
@@ -760,19 +1071,6 @@ for file_idx, (cao_folder, json_file) in enumerate(all_json_files):
                 )
             timed_out_files.append(json_file.name)
             continue
-        time.sleep(60)
-        rest_request_size = len(rest_text.encode('utf-8')) / 1024
-        rest_request_chars = len(rest_text)
-        print(
-            f'  {cao_number}: Rest LLM extraction (Request size: {rest_request_size:.1f} KB, {rest_request_chars:,} characters) [API {key_number}/{total_processes}]'
-            )
-        rest_start = time.time()
-        rest_extracted = extract_rest_fields_from_text(rest_text,
-            prompt_rest_markdown, filename=json_file.name)
-        rest_time = time.time() - rest_start
-        print(
-            f'  {cao_number}: Rest LLM extraction completed in {rest_time:.2f} seconds [API {key_number}/{total_processes}]'
-            )
         if rest_extracted is None:
             print(
                 f'  {cao_number}: ✗ Rest extraction failed for {json_file.name} [API {key_number}/{total_processes}]'
@@ -881,22 +1179,12 @@ for file_idx, (cao_folder, json_file) in enumerate(all_json_files):
                 f'  {cao_number}: Reached MAX_JSON_FILES limit, exiting [API {key_number}/{total_processes}]'
                 )
             break
-        else:
-            print(
-                f'  {cao_number}: Starting 3-minute delay... [API {key_number}/{total_processes}]'
-                )
-            delay_start = time.time()
-            time.sleep(180)
-            delay_time = time.time() - delay_start
-            print(
-                f'  {cao_number}: 3-minute delay completed in {delay_time:.2f} seconds [API {key_number}/{total_processes}]'
-                )
     except Exception as e:
         print(f'  {cao_number}: ✗ Error processing {json_file.name}: {e}')
         failed_files.append(json_file.name)
-        release_file_lock(json_file)
     finally:
         release_file_lock(json_file)
+llm_executor.shutdown(wait=True)
 os.makedirs(os.path.dirname(OUTPUT_EXCEL_PATH), exist_ok=True)
 df_results.to_excel(OUTPUT_EXCEL_PATH, index=False)
 if failed_files:
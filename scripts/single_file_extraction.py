@@ -39,9 +39,14 @@ OUTPUT:
     - Error logs: outputs/logs/failed_files_llm_extraction.txt, outputs/logs/structured_output_parsing_errors.txt
 """
 import os
+import re
 import sys
+import bisect
 import json
+import logging
 import time
+import orjson
+from functools import lru_cache
 from pathlib import Path
 
 # Add the parent directory to Python path so we can import monitoring
@@ -53,6 +58,15 @@ from pydantic import BaseModel, Field, ConfigDict
 from typing import List, Optional
 from monitoring.monitoring_3_1 import PerformanceMonitor
 
+# Progress messages of the extraction functions; the top-level CLI output
+# stays on print
+logger = logging.getLogger('single_file_extraction')
+_log_handler = logging.StreamHandler(sys.stdout)
+_log_handler.setFormatter(logging.Formatter('  %(levelname)s: %(message)s'))
+logger.addHandler(_log_handler)
+logger.setLevel(logging.DEBUG)
+logger.propagate = False
+
 
 class CAOExtractionSchema(BaseModel):
     """Schema for extracting structured data from Dutch CAO documents."""
@@ -189,11 +203,36 @@ def check_pdf_quality(pdf_path):
     3. File has valid PDF header
     4. File size is reasonable (not too small, not too large)
     5. File can be opened and read
+
+    The file is stat'ed once; the header checks are cached per
+    (path, mtime, size), so repeated checks of an unchanged file are free.
+    """
+    is_valid, message, _ = validate_and_measure(pdf_path)
+    return is_valid, message
+
+
+def validate_and_measure(pdf_path):
+    """
+    Run check_pdf_quality and also return the file size, from one os.stat.
+    Returns (is_valid, message, size_mb); size_mb is 0 if the file is missing.
     """
     try:
-        if not os.path.exists(pdf_path):
-            return False, 'PDF file does not exist'
-        file_size = os.path.getsize(pdf_path)
+        st = os.stat(pdf_path)
+    except FileNotFoundError:
+        return False, 'PDF file does not exist', 0
+    except PermissionError:
+        return False, 'Permission denied - cannot read PDF file', 0
+    except Exception as e:
+        return False, f'Error checking PDF: {str(e)}', 0
+    is_valid, message = _check_pdf_quality(pdf_path, st.st_mtime_ns, st.
+        st_size)
+    return is_valid, message, st.st_size / (1024 * 1024)
+
+
+@lru_cache(maxsize=8192)
+def _check_pdf_quality(pdf_path, mtime_ns, file_size):
+    """Size and header checks behind check_pdf_quality (cached)."""
+    try:
         if file_size == 0:
             return False, 'PDF file is empty'
         if file_size < 1024:
@@ -203,16 +242,15 @@ def check_pdf_quality(pdf_path):
             return (False,
                 f'PDF file too large ({file_size / (1024 * 1024):.1f}MB) - exceeds reasonable limit'
                 )
-        with open(pdf_path, 'rb') as f:
-            header = f.read(8)
-            if not header.startswith(b'%PDF'):
-                return (False,
-                    'File does not appear to be a valid PDF (missing %PDF header)'
-                    )
-            f.seek(0)
+        # One unbuffered read covers both the header and the truncation check
+        with open(pdf_path, 'rb', buffering=0) as f:
             sample_data = f.read(1024)
-            if len(sample_data) < 100:
-                return False, 'PDF file appears to be corrupted or truncated'
+        if not sample_data.startswith(b'%PDF'):
+            return (False,
+                'File does not appear to be a valid PDF (missing %PDF header)'
+                )
+        if len(sample_data) < 100:
+            return False, 'PDF file appears to be corrupted or truncated'
         return True, f'PDF appears valid ({file_size / (1024 * 1024):.1f}MB)'
     except PermissionError:
         return False, 'Permission denied - cannot read PDF file'
@@ -220,6 +258,18 @@ def check_pdf_quality(pdf_path):
         return False, f'Error checking PDF: {str(e)}'
 
 
+@lru_cache(maxsize=None)
+def _pdf_index(cao_number):
+    """Map PDF file names to paths for one CAO input folder (listed once)."""
+    try:
+        with os.scandir(f"{config['paths']['inputs_pdfs']}/{cao_number}"
+            ) as entries:
+            return {entry.name: entry.path for entry in entries if entry.
+                name.endswith('.pdf') and entry.is_file(follow_symlinks=False)}
+    except FileNotFoundError:
+        return {}
+
+
 def find_original_pdf(json_filename, cao_number):
     """
     Find the original PDF file that corresponds to the JSON file.
@@ -231,29 +281,24 @@ def find_original_pdf(json_filename, cao_number):
     3. Validating that the PDF actually exists and is valid
     """
     base_name = json_filename.replace('.json', '')
-    pdf_path = f"{config['paths']['inputs_pdfs']}/{cao_number}/{base_name}.pdf"
-    if os.path.exists(pdf_path):
-        is_valid, _ = check_pdf_quality(pdf_path)
-        if is_valid:
-            return pdf_path
-        else:
-            print(
-                f"  WARNING: Found PDF at {pdf_path} but it's not a valid PDF file"
-                )
-    possible_paths = [
-        f"{config['paths']['inputs_pdfs']}/{cao_number}/{base_name}.pdf",
-        f"{config['paths']['inputs_pdfs']}/{cao_number}/{base_name.replace('.pdf', '')}.pdf"
-        ]
-    for path in possible_paths:
-        if os.path.exists(path):
-            is_valid, _ = check_pdf_quality(path)
-            if is_valid:
-                return path
-            else:
-                print(
-                    f"  WARNING: Found PDF at {path} but it's not a valid PDF file"
-                    )
-    return None
+    pdf_index = _pdf_index(str(cao_number))
+    pdf_path = pdf_index.get(f'{base_name}.pdf') or pdf_index.get(
+        f"{base_name.replace('.pdf', '')}.pdf")
+    if pdf_path is None:
+        return None
+    is_valid, _ = check_pdf_quality(pdf_path)
+    if not is_valid:
+        logger.warning(
+            f"Found PDF at {pdf_path} but it's not a valid PDF file")
+        return None
+    return pdf_path
+
+
+# Characters the JSON sanitizer has to look at; everything between two
+# matches is copied in one slice
+_JSON_SPECIAL_CHARS_RE = re.compile('[\\\\"\'\n\r]')
+_VALID_JSON_ESCAPES = frozenset('"\\/bfnrtu')
+_CLOSING_QUOTE_FOLLOWERS = frozenset(' ,.:;-()%+/')
 
 
 def _sanitize_json_strings(possible_json: str) ->str:
@@ -261,69 +306,55 @@ def _sanitize_json_strings(possible_json: str) ->str:
     - Escapes raw newlines and carriage returns inside strings
     - Normalizes stray backslashes to double backslashes when not a valid escape
     - Escapes likely-unescaped quotes inside strings that would otherwise break parsing
+    Only quotes, backslashes and line breaks are visited one by one; the text
+    between them is copied as whole slices.
     """
     out_chars = []
     in_string = False
-    escaped = False
     quote_char = '"'
-    i = 0
-    while i < len(possible_json):
+    pos = 0
+    match = _JSON_SPECIAL_CHARS_RE.search(possible_json)
+    while match:
+        i = match.start()
         ch = possible_json[i]
-        nxt = possible_json[i + 1] if i + 1 < len(possible_json) else ''
-        if escaped:
-            if nxt in ['\\', '"', '/', 'b', 'f', 'n', 'r', 't']:
-                out_chars.append(ch)
-            else:
-                out_chars.append('\\')
-                i -= 1
-            escaped = False
-            i += 1
-            continue
+        nxt = possible_json[i + 1:i + 2]
+        out_chars.append(possible_json[pos:i])
+        pos = i + 1
         if ch == '\\':
-            if in_string:
-                escaped = True
-                out_chars.append(ch)
-                i += 1
-                continue
-            else:
+            if not in_string:
                 out_chars.append(ch)
-                i += 1
-                continue
-        if ch in ('"', "'"):
-            if in_string:
-                if ch == quote_char:
-                    if nxt and (nxt.isalnum() or nxt in [' ', ',', '.', ':',
-                        ';', '-', '(', ')', '%', '+', '/']):
-                        out_chars.append('\\"' if ch == '"' else "\\'")
-                        i += 1
-                        continue
-                    out_chars.append(ch)
-                    in_string = False
-                    i += 1
-                    continue
-                else:
-                    out_chars.append('\\"' if ch == '"' else "\\'")
-                    i += 1
-                    continue
+            elif nxt and nxt in _VALID_JSON_ESCAPES:
+                out_chars.append(ch + nxt)
+                pos = i + 2
             else:
+                out_chars.append('\\\\')
+        elif ch in ('"', "'"):
+            if not in_string:
                 out_chars.append(ch)
                 in_string = True
                 quote_char = ch
-                i += 1
-                continue
-        if in_string and ch == '\n':
-            out_chars.append('\\n')
-            i += 1
-            continue
-        if in_string and ch == '\r':
-            out_chars.append('\\r')
-            i += 1
-            continue
-        out_chars.append(ch)
-        i += 1
+            elif ch != quote_char or nxt and (nxt.isalnum() or nxt in
+                _CLOSING_QUOTE_FOLLOWERS):
+                out_chars.append('\\' + ch)
+            else:
+                out_chars.append(ch)
+                in_string = False
+        elif in_string:
+            out_chars.append('\\n' if ch == '\n' else '\\r')
+        else:
+            out_chars.append(ch)
+        match = _JSON_SPECIAL_CHARS_RE.search(possible_json, pos)
+    out_chars.append(possible_json[pos:])
     return ''.join(out_chars)
 
 
+# One translate table: drop BOM and zero-width characters, straighten
+# curly quotes
+_JSON_NORMALIZE_TABLE = str.maketrans({'\ufeff': None, '\u200b': None,
+    '\u200c': None, '\u200d': None, '\u201c': '"', '\u201d': '"',
+    '\u201e': '"', '\u201f': '"', '\u2018': "'", '\u2019': "'"})
+
+
 def _normalize_json_text(raw_text: str) ->str:
     """Normalize common LLM artifacts before JSON parsing.
     - Trim to the outermost {...}
@@ -334,158 +365,192 @@ def _normalize_json_text(raw_text: str) ->str:
     end = raw_text.rfind('}')
     if start != -1 and end != -1 and end > start:
         raw_text = raw_text[start:end + 1]
-    raw_text = raw_text.replace('\ufeff', '').replace('\u200b', '').replace(
-        '\u200c', '').replace('\u200d', '')
-    translation_map = {ord('“'): '"', ord('”'): '"', ord('‟'): '"', ord('‟'
-        ): '"', ord('‟'): '"', ord('’'): "'", ord('‘'): "'"}
-    raw_text = raw_text.translate(translation_map)
-    return raw_text
+    return raw_text.translate(_JSON_NORMALIZE_TABLE)
+
+
+def write_output_atomically(output_file, data):
+    """
+    Write bytes to output_file via a per-process temporary file and
+    os.replace, so an interrupted run never leaves a truncated JSON behind
+    that a later run would skip as already processed.
+    """
+    tmp_file = output_file.with_suffix(output_file.suffix +
+        f'.tmp.{os.getpid()}')
+    try:
+        with open(tmp_file, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_file, output_file)
+    except BaseException:
+        try:
+            os.unlink(tmp_file)
+        except OSError:
+            pass
+        raise
+
+
+def is_transient_error(error):
+    """Return True for API errors worth retrying (timeouts, 5xx, rate limits)."""
+    error_str = str(error).lower()
+    return any(marker in error_str for marker in ('timeout', 'deadline',
+        '429', '500', '503', '504', 'unavailable', 'connection', 'quota'))
+
+
+def parse_structured_output(raw_output):
+    """
+    Parse the model's JSON output. Structured output is normally valid JSON,
+    so orjson is tried first; only if that fails is the text normalized and
+    sanitized before parsing again. Returns None if the output stays invalid.
+    """
+    try:
+        return orjson.loads(raw_output)
+    except orjson.JSONDecodeError:
+        pass
+    try:
+        return json.loads(_sanitize_json_strings(_normalize_json_text(
+            raw_output)))
+    except json.JSONDecodeError:
+        return None
 
 
-def extract_with_pdf_upload(pdf_path, filename, cao_number, max_retries=5):
+# Notices per PDF size: _PDF_SIZE_TIERS[i] applies to sizes above
+# _PDF_SIZE_BOUNDS_MB[i - 1] up to _PDF_SIZE_BOUNDS_MB[i]; an error skips the file
+_PDF_SIZE_BOUNDS_MB = [0.1, 0.5, 5.0, 10.0, 15.0, 20.0]
+_PDF_SIZE_TIERS = [('warning',
+    'Very small PDF ({size:.2f}MB) - may be low quality or empty'), ('info',
+    'Small PDF ({size:.2f}MB) - ensure good quality'), None, ('info',
+    'Large PDF file ({size:.1f}MB) - may take longer to process'), (
+    'warning', 'Large PDF file ({size:.1f}MB) - may cause timeout issues'),
+    ('warning',
+    'Very large PDF file ({size:.1f}MB) - approaching 20MB limit'), ('error',
+    'PDF file too large ({size:.1f}MB) - exceeds 20MB limit. Skipping file.')]
+_PAGE_COUNT_BOUNDS = [500, 800]
+_PAGE_COUNT_TIERS = [None, ('info',
+    'Estimated {pages} pages ({tokens:,} tokens) - large document'), (
+    'warning',
+    'Estimated {pages} pages ({tokens:,} tokens) - approaching 1,000 page limit'
+    )]
+
+
+def extract_with_pdf_upload(pdf_path, filename, cao_number, file_size_mb,
+    max_retries=5):
     """
     Extract using PDF upload approach - always upload the whole PDF.
+    The caller has already validated the PDF with validate_and_measure and
+    passes its size in MB.
     """
-    print(f'  INFO: Using PDF upload approach for {filename}')
+    logger.info(f'Using PDF upload approach for {filename}')
     start_time = time.time()
-    file_size_mb = os.path.getsize(pdf_path) / (1024 * 1024)
-    if not pdf_path or not os.path.exists(pdf_path):
-        print(f'  ERROR: No original PDF found for {filename}')
-        performance_monitor.log_extraction(filename=filename, file_size_mb=
-            0, processing_time=time.time() - start_time, usage_metadata=
-            None, success=False, error_message='PDF not found',
-            api_key_used=key_number, process_id=process_id, cao_number=
-            cao_number)
-        return None
-    print(f'  INFO: Found original PDF: {pdf_path}')
-    is_valid, quality_message = check_pdf_quality(pdf_path)
-    if not is_valid:
-        print(f'  ERROR: PDF quality check failed: {quality_message}')
-        return None
-    else:
-        print(f'  INFO: {quality_message}')
-    file_size_mb = os.path.getsize(pdf_path) / (1024 * 1024)
-    if file_size_mb > 20.0:
-        print(
-            f'  ERROR: PDF file too large ({file_size_mb:.1f}MB) - exceeds 20MB limit. Skipping file.'
-            )
-        return None
-    elif file_size_mb > 15.0:
-        print(
-            f'  WARNING: Very large PDF file ({file_size_mb:.1f}MB) - approaching 20MB limit'
-            )
-    elif file_size_mb > 10.0:
-        print(
-            f'  WARNING: Large PDF file ({file_size_mb:.1f}MB) - may cause timeout issues'
-            )
-    elif file_size_mb > 5.0:
-        print(
-            f'  INFO: Large PDF file ({file_size_mb:.1f}MB) - may take longer to process'
-            )
+    logger.info(f'Found original PDF: {pdf_path}')
+    # Size and page-count notices, looked up by tier instead of if/elif chains
+    size_tier = _PDF_SIZE_TIERS[bisect.bisect_left(_PDF_SIZE_BOUNDS_MB,
+        file_size_mb)]
+    if size_tier is not None:
+        level, message = size_tier
+        getattr(logger, level)(message.format(size=file_size_mb))
+        if level == 'error':
+            return None
     estimated_pages = int(file_size_mb * 1024 / 50)
     estimated_tokens = estimated_pages * 258
-    if file_size_mb < 0.1:
-        print(
-            f'  WARNING: Very small PDF ({file_size_mb:.2f}MB) - may be low quality or empty'
-            )
-    elif file_size_mb < 0.5:
-        print(f'  INFO: Small PDF ({file_size_mb:.2f}MB) - ensure good quality'
-            )
-    if estimated_pages > 800:
-        print(
-            f'  WARNING: Estimated {estimated_pages} pages ({estimated_tokens:,} tokens) - approaching 1,000 page limit'
-            )
-    elif estimated_pages > 500:
-        print(
-            f'  INFO: Estimated {estimated_pages} pages ({estimated_tokens:,} tokens) - large document'
-            )
+    page_tier = _PAGE_COUNT_TIERS[bisect.bisect_left(_PAGE_COUNT_BOUNDS,
+        estimated_pages)]
+    if page_tier is not None:
+        level, message = page_tier
+        getattr(logger, level)(message.format(pages=estimated_pages,
+            tokens=estimated_tokens))
+    # Prompt, timeout and generation config do not change between retries
+    extraction_prompt = f"""
+Extract information from this Dutch CAO (Collective Labor Agreement) PDF document.
+
+TASK: Categorize and extract relevant information into the specified fields based on the document content.
+
+CRITICAL RULES:
+- Extract ONLY information explicitly present in the document
+- Copy text literally (dates, numbers, percentages, units)
+- Be precise: NO paraphrasing, NO interpretation, NO added explanations, NO decorative elements, NO unnecessary separator lines or formatting characters
+
+CONTENT INCLUSION RULES:
+- Include relevant numerical values, percentages, amounts, and time periods
+- Include conditions, requirements, procedural steps, entitlements, allowances, and eligibility criteria
+- For tables, include short descriptions and table structure with headers and all data rows
+- WAGE TABLES: Extract ALL wage tables. Skip only if tables are identical except for the unit (hourly vs monthly vs yearly rates for the same job/date).
+
+TABLE FORMATTING:
+- Preserve table structure: each table row should be a single array element containing all columns
+- Keep table headers, descriptions, column names, and data rows together as complete units
+- Maintain column alignment and spacing within each row
+
+Document: {filename}
+"""
+    if file_size_mb > 8.0:
+        timeout_seconds = 1200
+    elif file_size_mb > 5.0:
+        timeout_seconds = 900
+    else:
+        timeout_seconds = 600
+    generation_config = {'temperature': LLM_TEMPERATURE, 'top_p':
+        LLM_TOP_P, 'top_k': LLM_TOP_K, 'max_output_tokens': LLM_MAX_TOKENS,
+        'candidate_count': LLM_CANDIDATE_COUNT, 'seed': LLM_SEED,
+        'presence_penalty': LLM_PRESENCE_PENALTY, 'frequency_penalty':
+        LLM_FREQUENCY_PENALTY, 'response_mime_type': 'application/json',
+        'response_schema': CAOExtractionSchema, 'thinking_config': types.
+        ThinkingConfig(thinking_budget=LLM_THINKING_BUDGET), 'http_options':
+        types.HttpOptions(timeout=timeout_seconds * 1000)}
     for attempt in range(max_retries):
         try:
-            if file_size_mb > 8.0:
-                timeout_seconds = 1200
-            elif file_size_mb > 5.0:
-                timeout_seconds = 900
-            else:
-                timeout_seconds = 600
-            print(f'  INFO: Uploading PDF file to Gemini...')
+            logger.info(f'Uploading PDF file to Gemini...')
             try:
-                uploaded_file = client.files.upload(file=pdf_path)
-                print(f'  INFO: File uploaded successfully: {uploaded_file.name}')
+                # Hand the SDK an open file so the upload is read in chunks
+                with open(pdf_path, 'rb', buffering=1 << 20) as pdf_file:
+                    uploaded_file = client.files.upload(file=pdf_file,
+                        config={'mime_type': 'application/pdf'})
+                logger.info(f'File uploaded successfully: {uploaded_file.name}')
             except Exception as e:
-                print(f'  ERROR: File upload failed: {e}')
+                logger.error(f'File upload failed: {e}')
                 raise ValueError(f'Failed to upload file {filename}: {e}')
             
             # Check file state and wait for processing
             max_wait_seconds = (300 if file_size_mb <= 5.0 else 600 if 
                 file_size_mb <= 10.0 else 900)
+            # Poll with a growing interval (2s, 3s, 4.5s, ... capped at 30s)
+            # so long-running uploads cost a handful of files.get calls
             poll_interval_seconds = 2
             waited = 0
             
-            print(f'  INFO: Waiting for file processing (max {max_wait_seconds}s)...')
+            logger.info(f'Waiting for file processing (max {max_wait_seconds}s)...')
             while waited < max_wait_seconds:
                 try:
                     file_resource = client.files.get(name=uploaded_file.name)
+                except Exception as e:
+                    if not is_transient_error(e):
+                        raise
+                    logger.warning(f'Error checking file state: {e}')
+                else:
                     if file_resource.state.name == 'ACTIVE':
-                        print(f'  INFO: File is ready for processing')
+                        logger.info(f'File is ready for processing')
                         break
                     elif file_resource.state.name == 'FAILED':
                         raise ValueError(
                             f'Uploaded file processing FAILED for {filename}')
                     else:
-                        print(f'  INFO: File state: {file_resource.state.name} (waited {waited}s)')
-                except Exception as e:
-                    print(f'  WARNING: Error checking file state: {e}')
-                    time.sleep(poll_interval_seconds)
-                    waited += poll_interval_seconds
-                    continue
+                        logger.info(f'File state: {file_resource.state.name} (waited {waited:.0f}s)')
                 time.sleep(poll_interval_seconds)
                 waited += poll_interval_seconds
+                poll_interval_seconds = min(poll_interval_seconds * 1.5, 30)
             
             if waited >= max_wait_seconds:
                 raise TimeoutError(
                     f'Uploaded file not ACTIVE after {max_wait_seconds}s for {filename}'
                     )
-            extraction_prompt = f"""
-Extract information from this Dutch CAO (Collective Labor Agreement) PDF document.
-
-TASK: Categorize and extract relevant information into the specified fields based on the document content.
-
-CRITICAL RULES:
-- Extract ONLY information explicitly present in the document
-- Copy text literally (dates, numbers, percentages, units)
-- Be precise: NO paraphrasing, NO interpretation, NO added explanations, NO decorative elements, NO unnecessary separator lines or formatting characters
-
-CONTENT INCLUSION RULES:
-- Include relevant numerical values, percentages, amounts, and time periods
-- Include conditions, requirements, procedural steps, entitlements, allowances, and eligibility criteria
-- For tables, include short descriptions and table structure with headers and all data rows
-- WAGE TABLES: Extract ALL wage tables. Skip only if tables are identical except for the unit (hourly vs monthly vs yearly rates for the same job/date).
-
-TABLE FORMATTING:
-- Preserve table structure: each table row should be a single array element containing all columns
-- Keep table headers, descriptions, column names, and data rows together as complete units
-- Maintain column alignment and spacing within each row
-
-Document: {filename}
-"""
             response = client.models.generate_content(model=GEMINI_MODEL,
-                contents=[extraction_prompt, uploaded_file], config={
-                'temperature': LLM_TEMPERATURE, 'top_p': LLM_TOP_P, 'top_k':
-                LLM_TOP_K, 'max_output_tokens': LLM_MAX_TOKENS,
-                'candidate_count': LLM_CANDIDATE_COUNT, 'seed': LLM_SEED,
-                'presence_penalty': LLM_PRESENCE_PENALTY,
-                'frequency_penalty': LLM_FREQUENCY_PENALTY,
-                'response_mime_type': 'application/json', 'response_schema':
-                CAOExtractionSchema, 'thinking_config': types.
-                ThinkingConfig(thinking_budget=LLM_THINKING_BUDGET),
-                'http_options': types.HttpOptions(timeout=timeout_seconds * 1000)})
+                contents=[extraction_prompt, uploaded_file], config=
+                generation_config)
             if response is None:
                 raise ValueError('No response received from model')
             # For structured output, response.text is the reliable way to get JSON string
             if hasattr(response, 'text') and response.text:
                 processing_time = time.time() - start_time
-                print(
-                    f'  INFO: Successfully extracted structured data from PDF (time: {processing_time:.1f}s)'
+                logger.info(
+                    f'Successfully extracted structured data from PDF (time: {processing_time:.1f}s)'
                     )
                 performance_monitor.log_extraction(filename=filename,
                     file_size_mb=file_size_mb, processing_time=
@@ -496,9 +561,9 @@ Document: {filename}
                 # Clean up uploaded file
                 try:
                     client.files.delete(name=uploaded_file.name)
-                    print(f'  INFO: Cleaned up uploaded file: {uploaded_file.name}')
+                    logger.info(f'Cleaned up uploaded file: {uploaded_file.name}')
                 except Exception as e:
-                    print(f'  WARNING: Failed to clean up file {uploaded_file.name}: {e}')
+                    logger.warning(f'Failed to clean up file {uploaded_file.name}: {e}')
                 
                 return response.text
             else:
@@ -508,67 +573,67 @@ Document: {filename}
             try:
                 if 'uploaded_file' in locals():
                     client.files.delete(name=uploaded_file.name)
-                    print(f'  INFO: Cleaned up uploaded file after error: {uploaded_file.name}')
+                    logger.info(f'Cleaned up uploaded file after error: {uploaded_file.name}')
             except Exception as cleanup_error:
-                print(f'  WARNING: Failed to clean up file after error: {cleanup_error}')
+                logger.warning(f'Failed to clean up file after error: {cleanup_error}')
             error_str = str(e).lower()
-            print(
-                f'  DEBUG: PDF upload error type: {type(e).__name__}, Error message: {error_str}'
+            logger.debug(
+                f'PDF upload error type: {type(e).__name__}, Error message: {error_str}'
                 )
-            print(f'  DEBUG: Full error details: {e}')
+            logger.debug(f'Full error details: {e}')
             if hasattr(e, '__traceback__'):
                 import traceback
-                print(f'  DEBUG: Traceback: {traceback.format_exc()}')
+                logger.debug(f'Traceback: {traceback.format_exc()}')
             if ('deadlineexceeded' in error_str or '504' in error_str or 
                 'timeout' in error_str):
                 if attempt < max_retries - 1:
                     wait_time = 120 * 2 ** attempt
-                    print(
-                        f'  Attempt {attempt + 1} failed (timeout), retrying in {wait_time // 60} minutes...'
+                    logger.warning(
+                        f'Attempt {attempt + 1} failed (timeout), retrying in {wait_time // 60} minutes...'
                         )
                     time.sleep(wait_time)
                     continue
                 else:
-                    print(
-                        f'  All {max_retries} attempts failed with timeout errors'
+                    logger.error(
+                        f'All {max_retries} attempts failed with timeout errors'
                         )
                     return None
             elif 'serviceunavailable' in error_str or '503' in error_str or 'connection reset' in error_str:
                 if attempt < max_retries - 1:
                     wait_time = 60 * 2 ** attempt
-                    print(
-                        f'  Attempt {attempt + 1} failed (service unavailable), retrying in {wait_time // 60} minutes...'
+                    logger.warning(
+                        f'Attempt {attempt + 1} failed (service unavailable), retrying in {wait_time // 60} minutes...'
                         )
                     time.sleep(wait_time)
                     continue
                 else:
-                    print(
-                        f'  All {max_retries} attempts failed with service unavailable errors'
+                    logger.error(
+                        f'All {max_retries} attempts failed with service unavailable errors'
                         )
                     return None
             elif 'quota' in error_str or '429' in error_str:
                 if attempt < max_retries - 1:
                     wait_time = 60 * 2 ** attempt
-                    print(
-                        f'  Attempt {attempt + 1} failed (quota), retrying in {wait_time // 60} minutes...'
+                    logger.warning(
+                        f'Attempt {attempt + 1} failed (quota), retrying in {wait_time // 60} minutes...'
                         )
                     time.sleep(wait_time)
                     continue
                 else:
-                    print(
-                        f'  All {max_retries} attempts failed with quota errors'
+                    logger.error(
+                        f'All {max_retries} attempts failed with quota errors'
                         )
                     return None
             elif attempt < max_retries - 1:
                 wait_time = 30 * 2 ** attempt
-                print(
-                    f'  Attempt {attempt + 1} failed ({type(e).__name__}), retrying in {wait_time} seconds...'
+                logger.warning(
+                    f'Attempt {attempt + 1} failed ({type(e).__name__}), retrying in {wait_time} seconds...'
                     )
                 time.sleep(wait_time)
                 continue
             else:
                 processing_time = time.time() - start_time
-                print(f'  PDF upload failed after {max_retries} attempts')
+                logger.error(f'PDF upload failed after {max_retries} attempts')
                 performance_monitor.log_extraction(filename=filename,
                     file_size_mb=file_size_mb, processing_time=
                     processing_time, usage_metadata=None, success=False,
@@ -583,12 +648,11 @@ Document: {filename}
 # Process the single specified file
 pdf_path = f"{config['paths']['inputs_pdfs']}/{target_cao_number}/{target_pdf_filename}"
 
-if not os.path.exists(pdf_path):
+# Check PDF quality (this also covers a missing file)
+is_valid, quality_message, pdf_size_mb = validate_and_measure(pdf_path)
+if quality_message == 'PDF file does not exist':
     print(f"❌ PDF file not found: {pdf_path}")
     sys.exit(1)
-
-# Check PDF quality
-is_valid, quality_message = check_pdf_quality(pdf_path)
 if not is_valid:
     print(f"❌ PDF quality check failed: {quality_message}")
     sys.exit(1)
@@ -606,9 +670,13 @@ if not output_filename.endswith('.json'):
 
 output_file = output_cao_folder / output_filename
 
-# Check if already processed
-if output_file.exists():
-    print(f"⚠️  File already processed: {output_file}")
+# Check if already processed (one stat, reused for the size shown)
+try:
+    output_stat = output_file.stat()
+except FileNotFoundError:
+    output_stat = None
+if output_stat is not None:
+    print(f"⚠️  File already processed: {output_file} ({output_stat.st_size:,} bytes)")
     print("Delete the existing file if you want to re-process it.")
     sys.exit(0)
 
@@ -621,7 +689,8 @@ try:
     print(f"🤖 Starting extraction...")
     extraction_start = time.time()
     
-    raw_output = extract_with_pdf_upload(pdf_path, target_pdf_filename, target_cao_number)
+    raw_output = extract_with_pdf_upload(pdf_path, target_pdf_filename,
+        target_cao_number, pdf_size_mb)
     
     extraction_time = time.time() - extraction_start
     
@@ -629,10 +698,19 @@ try:
         print(f"❌ LLM extraction failed")
         sys.exit(1)
     
-    # Save the output
+    # Save the output, re-serialized when it parses as JSON
     print(f"💾 Saving structured output (length: {len(raw_output)} chars)")
-    with open(output_file, 'w', encoding='utf-8') as f:
-        f.write(raw_output)
+    parsed_output = parse_structured_output(raw_output)
+    if parsed_output is not None:
+        write_output_atomically(output_file, orjson.dumps(parsed_output,
+            option=orjson.OPT_INDENT_2))
+    else:
+        print("⚠️  Output is not valid JSON, saving raw text")
+        os.makedirs('outputs/logs', exist_ok=True)
+        with open('outputs/logs/structured_output_parsing_errors.txt', 'a',
+            encoding='utf-8') as f:
+            f.write(f"{time.strftime('%Y-%m-%d %H:%M:%S')} - API {key_number}: {target_pdf_filename}\n")
+        write_output_atomically(output_file, raw_output.encode('utf-8'))
     
     print(f"✅ Extraction completed successfully in {extraction_time:.2f} seconds")
     print(f"📁 Output saved to: {output_file}")
@@ -651,11 +729,3 @@ except Exception as e:
     
 finally:
     release_file_lock(output_file)
-
-def main():
-    """Main entry point for the LLM extraction pipeline (new version)."""
-    # The script runs automatically when imported or executed
-    pass
-
-if __name__ == "__main__":
-    main()